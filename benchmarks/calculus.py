@@ -0,0 +1,50 @@
+"""
+Benchmarks of derivatives of multivector fields.
+"""
+from .common import (
+    CURVILINEAR, METRICS, make_algebra, make_curvilinear, skip_if_too_large,
+)
+
+FIELDS = ['scalar', 'vector', 'general']
+
+
+def _field(ga, kind):
+    if kind == 'scalar':
+        return ga.mv('f', 'scalar', f=True)
+    elif kind == 'vector':
+        return ga.mv('F', 'vector', f=True)
+    return ga.mv('F', 'mv', f=True)
+
+
+class TimeGrad:
+    params = ([2, 3, 4], METRICS, FIELDS)
+    param_names = ['n', 'metric', 'field']
+
+    def setup(self, n, metric, field):
+        skip_if_too_large(n, metric)
+        self.ga = make_algebra(n, metric, coords=True)
+        self.F = _field(self.ga, field)
+        self.ga.grad * self.F
+
+    def time_grad(self, n, metric, field):
+        self.ga.grad * self.F
+
+    def time_rgrad(self, n, metric, field):
+        self.F * self.ga.rgrad
+
+
+class TimeCurvilinearGrad:
+    params = (CURVILINEAR, FIELDS)
+    param_names = ['system', 'field']
+
+    def setup(self, system, field):
+        self.ga = make_curvilinear(system)
+        self.F = _field(self.ga, field)
+        self.ga.grad * self.F
+
+    def time_grad(self, system, field):
+        self.ga.grad * self.F
+
+    def time_div_curl(self, system, field):
+        self.ga.grad | self.F
+        self.ga.grad ^ self.F
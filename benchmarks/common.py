@@ -0,0 +1,97 @@
+"""
+Algebras and multivectors shared by the benchmarks.
+
+Benchmarks are parametrized over the dimension ``n`` of the algebra, and the
+kind of metric:
+
+``'orthogonal'``
+    A numeric diagonal metric, with one negative signature
+``'non-orthogonal'``
+    A numeric metric coupling each basis vector to its neighbours
+``'symbolic'``
+    A metric whose entries are all symbols, written with ``#``
+
+Symbolic and non-orthogonal metrics get expensive quickly, so benchmarks
+skip the larger algebras for them by raising :exc:`NotImplementedError` from
+``setup``, as asv expects.
+"""
+from sympy import Rational, sin, symbols
+
+from galgebra.ga import Ga
+
+DIMENSIONS = [2, 3, 4, 5, 6, 7, 8]
+METRICS = ['orthogonal', 'non-orthogonal', 'symbolic']
+
+# the largest dimension benchmarked for each kind of metric
+MAX_DIMENSION = {'orthogonal': 8, 'non-orthogonal': 6, 'symbolic': 4}
+
+KINDS = ['scalar', 'vector', 'bivector', 'general']
+
+# the coordinate systems of ``Ga.presets``
+CURVILINEAR = ['cartesian', 'cylindrical', 'spherical', 'parabolic']
+
+
+def skip_if_too_large(n, metric, max_dimension=None):
+    limit = MAX_DIMENSION[metric]
+    if max_dimension is not None:
+        limit = min(limit, max_dimension)
+    if n > limit:
+        raise NotImplementedError
+
+
+def basis_names(n):
+    return 'e*' + '|'.join(str(i + 1) for i in range(n))
+
+
+def metric_of(n, metric):
+    """ The ``g`` argument of :class:`~galgebra.ga.Ga` for a kind of metric """
+    if metric == 'orthogonal':
+        return [1] * (n - 1) + [-1]
+    elif metric == 'non-orthogonal':
+        return ','.join(
+            ' '.join('2' if i == j else '1' if abs(i - j) == 1 else '0' for j in range(n))
+            for i in range(n)
+        )
+    elif metric == 'symbolic':
+        return ','.join(' '.join('#' for j in range(n)) for i in range(n))
+    raise ValueError(metric)
+
+
+def make_algebra(n, metric, coords=False, **kwargs):
+    """ An algebra of dimension ``n``, optionally with coordinates ``x_1``, ... """
+    if coords:
+        kwargs['coords'] = symbols('x_1:{}'.format(n + 1), real=True)
+    return Ga(basis_names(n), g=metric_of(n, metric), **kwargs)
+
+
+def make_curvilinear(system):
+    """ The algebra of the tangent space of a three-dimensional coordinate system """
+    if system == 'cartesian':
+        coords = x, y, z = symbols('x y z', real=True)
+        return Ga('e', g=[1, 1, 1], coords=coords)
+    elif system == 'cylindrical':
+        coords = r, theta, z = symbols('r theta z', real=True)
+        return Ga('e', g=[1, r**2, 1], coords=coords, norm=True)
+    elif system == 'spherical':
+        coords = r, theta, phi = symbols('r theta phi', real=True)
+        return Ga('e', g=[1, r**2, r**2 * sin(theta)**2], coords=coords, norm=True)
+    elif system == 'parabolic':
+        coords = u, v, z = symbols('u v z', real=True)
+        return Ga('e', g=[u**2 + v**2, u**2 + v**2, 1], coords=coords, norm=True)
+    raise ValueError(system)
+
+
+def symbolic_mv(ga, root, kind):
+    """ A multivector of the given kind with symbolic coefficients """
+    if kind == 'scalar':
+        return ga.mv(root, 'scalar')
+    elif kind == 'general':
+        return ga.mv(root, 'mv')
+    return ga.mv(root, kind)
+
+
+def numeric_mv(ga, seed=1):
+    """ A general multivector with small rational coefficients """
+    # a fixed sequence, so that results do not depend on a random state
+    coefs = [Rational((seed * 7 + 3 * i) % 11 - 5, (i % 3) + 1) for i in range(len(ga.blades.flat))]
+    return sum((c * blade for c, blade in zip(coefs, ga.mv_blades.flat)), ga.mv(0, 'scalar'))
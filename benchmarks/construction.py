@@ -0,0 +1,42 @@
+"""
+Benchmarks of constructing algebras.
+"""
+from galgebra.ga import Ga
+
+from .common import (
+    CURVILINEAR, DIMENSIONS, METRICS, basis_names, make_curvilinear, metric_of, skip_if_too_large,
+)
+
+
+class TimeConstruction:
+    params = (DIMENSIONS, METRICS)
+    param_names = ['n', 'metric']
+
+    def setup(self, n, metric):
+        skip_if_too_large(n, metric)
+        self.names = basis_names(n)
+        self.g = metric_of(n, metric)
+
+    def time_construct(self, n, metric):
+        Ga(self.names, g=self.g)
+
+    def time_construct_and_multiply(self, n, metric):
+        # construction is lazy, so also time the first product of basis vectors
+        ga = Ga(self.names, g=self.g)
+        basis = ga.mv_basis
+        basis[0] * basis[-1]
+
+    def time_pseudoscalar(self, n, metric):
+        Ga(self.names, g=self.g).i
+
+
+class TimeCurvilinear:
+    params = CURVILINEAR
+    param_names = ['system']
+
+    def time_construct(self, system):
+        make_curvilinear(system)
+
+    def time_construct_grad(self, system):
+        # the gradient needs the derivatives of the basis vectors
+        make_curvilinear(system).grad
@@ -0,0 +1,69 @@
+"""
+Benchmarks of inverses and exponentials of multivectors.
+"""
+from sympy import symbols
+
+from galgebra.mv import Mv
+
+from .common import METRICS, make_algebra, numeric_mv, skip_if_too_large
+
+INVERSES = ['hitzer_inverse', 'shirokov_inverse']
+
+
+class TimeInverse:
+    params = ([2, 3, 4, 5], ['orthogonal', 'non-orthogonal'], INVERSES)
+    param_names = ['n', 'metric', 'method']
+
+    def setup(self, n, metric, method):
+        skip_if_too_large(n, metric)
+        self.ga = make_algebra(n, metric)
+        self.A = numeric_mv(self.ga)
+        self.inverse = getattr(Mv, method)
+
+    def time_inverse(self, n, metric, method):
+        self.inverse(self.A)
+
+
+class TimeVersorInverse:
+    params = ([2, 3, 4, 5, 6, 7, 8], METRICS)
+    param_names = ['n', 'metric']
+
+    def setup(self, n, metric):
+        skip_if_too_large(n, metric)
+        self.ga = make_algebra(n, metric)
+        # ``inv`` only handles multivectors whose reverse square is a scalar
+        a = self.ga.mv('a', 'vector')
+        b = self.ga.mv('b', 'vector')
+        self.V = a * b
+
+    def time_inv(self, n, metric):
+        self.V.inv()
+
+
+class TimeInverseSymbolic:
+    params = ([2, 3], METRICS)
+    param_names = ['n', 'metric']
+
+    def setup(self, n, metric):
+        skip_if_too_large(n, metric)
+        self.ga = make_algebra(n, metric)
+        self.A = self.ga.mv('A', 'mv')
+
+    def time_hitzer_inverse(self, n, metric):
+        self.A.hitzer_inverse()
+
+
+class TimeExp:
+    params = ([2, 3, 4, 5, 6], METRICS)
+    param_names = ['n', 'metric']
+
+    def setup(self, n, metric):
+        skip_if_too_large(n, metric)
+        self.ga = make_algebra(n, metric)
+        theta = symbols('theta', real=True)
+        e = self.ga.mv_basis
+        # a blade, whose square is a scalar
+        self.B = theta * (e[0] ^ e[1])
+
+    def time_exp(self, n, metric):
+        self.B.exp(hint='-')
@@ -0,0 +1,52 @@
+"""
+Benchmarks of printing multivectors.
+
+Printing simplifies the coefficients, and the results of simplifying are
+cached across calls by :class:`~galgebra.metric.Simp`.  :class:`TimePrinting`
+clears that cache before each measurement and prints once per measurement,
+while :class:`TimePrintingCached` measures printing with the cache already
+filled.
+"""
+from galgebra.metric import Simp
+from galgebra.printer import latex
+
+from .common import METRICS, make_algebra, skip_if_too_large, symbolic_mv
+
+
+class TimePrinting:
+    params = ([2, 3, 4, 5, 6], METRICS, ['vector', 'general'])
+    param_names = ['n', 'metric', 'kind']
+    # a second call in the same measurement would hit the simplify cache
+    number = 1
+    warmup_time = 0
+
+    def setup(self, n, metric, kind):
+        skip_if_too_large(n, metric)
+        self.ga = make_algebra(n, metric)
+        self.A = symbolic_mv(self.ga, 'A', kind)
+        Simp.clear_cache()
+
+    def time_str(self, n, metric, kind):
+        str(self.A)
+
+    def time_latex(self, n, metric, kind):
+        latex(self.A)
+
+
+class TimePrintingCached:
+    params = TimePrinting.params
+    param_names = TimePrinting.param_names
+
+    def setup(self, n, metric, kind):
+        skip_if_too_large(n, metric)
+        self.ga = make_algebra(n, metric)
+        self.A = symbolic_mv(self.ga, 'A', kind)
+        Simp.clear_cache()
+        str(self.A)
+        latex(self.A)
+
+    def time_str(self, n, metric, kind):
+        str(self.A)
+
+    def time_latex(self, n, metric, kind):
+        latex(self.A)
@@ -0,0 +1,48 @@
+"""
+Benchmarks of the products of multivectors.
+
+The product tables are filled in ``setup``, so these time the products
+themselves rather than the tables.
+"""
+import operator
+
+from .common import DIMENSIONS, KINDS, METRICS, make_algebra, skip_if_too_large, symbolic_mv
+
+OPERATORS = {
+    '*': operator.mul,
+    '^': operator.xor,
+    '|': operator.or_,
+    '<': operator.lt,
+    '>': operator.gt,
+}
+
+
+class TimeProducts:
+    params = (DIMENSIONS, METRICS, KINDS, list(OPERATORS))
+    param_names = ['n', 'metric', 'kind', 'op']
+
+    def setup(self, n, metric, kind, op):
+        # products of general multivectors have 4**n pairs of terms
+        skip_if_too_large(n, metric, max_dimension=6 if kind == 'general' else None)
+        self.ga = make_algebra(n, metric)
+        self.A = symbolic_mv(self.ga, 'A', kind)
+        self.B = symbolic_mv(self.ga, 'B', kind)
+        self.op = OPERATORS[op]
+        self.op(self.A, self.B)
+
+    def time_product(self, n, metric, kind, op):
+        self.op(self.A, self.B)
+
+
+class TimeTables:
+    params = (DIMENSIONS, METRICS)
+    param_names = ['n', 'metric']
+
+    def setup(self, n, metric):
+        skip_if_too_large(n, metric)
+        if metric == 'symbolic':
+            # precompute is only available for numeric metrics
+            raise NotImplementedError
+
+    def time_precompute(self, n, metric):
+        make_algebra(n, metric, precompute=True)
@@ -0,0 +1,22 @@
+"""
+Benchmarks of linear transformations.
+"""
+from .common import METRICS, make_algebra, skip_if_too_large, symbolic_mv
+
+
+class TimeLt:
+    params = ([2, 3, 4, 5], METRICS, ['vector', 'general'])
+    param_names = ['n', 'metric', 'kind']
+
+    def setup(self, n, metric, kind):
+        skip_if_too_large(n, metric)
+        # symbolic transformations are functions of the coordinates
+        self.ga = make_algebra(n, metric, coords=True)
+        self.L = self.ga.lt('L')
+        self.X = symbolic_mv(self.ga, 'X', kind)
+
+    def time_construct(self, n, metric, kind):
+        self.ga.lt('L')
+
+    def time_apply(self, n, metric, kind):
+        self.L(self.X)
@@ -16,6 +16,9 @@ Submodules
     metric
     ga
     mv
+    mvarray
+    lazy
+    profiling
     lt
     dop
     atoms
@@ -4,6 +4,8 @@ class cached_property:
         self.fget = getter
         self.__name__ = getter.__name__
         self.__doc__ = getter.__doc__
+        # so that abc sees abstract getters
+        self.__isabstractmethod__ = getattr(getter, '__isabstractmethod__', False)
 
     def __set_name__(self, owner, name):
         self.__name__ = name
@@ -23,6 +25,6 @@ class cached_property:
         if obj is None:
             return self
         val = self.fget(obj)
-        # this entry hides the _cached_property
-        setattr(obj, self.__name__, val)
-        return val
+        # this entry hides the _cached_property.  If another thread got here
+        # first, use its value so that all callers see the same object.
+        return vars(obj).setdefault(self.__name__, val)
@@ -0,0 +1,94 @@
+"""
+Generation of vectorized NumPy functions from tables of products of basis
+blades.
+
+NumPy is an optional dependency, and is only imported when a function is
+generated.
+"""
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sympy import Expr, Integer
+
+__all__ = ['product_kernel']
+
+
+def product_kernel(
+    name: str, n_blades: int, table: Iterable[Tuple[int, int, int, Expr]],
+    exact: bool = False,
+) -> Callable:
+    """
+    Generate a function computing a bilinear product of coefficient arrays.
+
+    The generated function takes two arrays whose last axis holds the
+    ``n_blades`` blade coefficients, broadcasts the remaining axes against
+    each other, and returns the coefficients of the product.
+
+    Parameters
+    ----------
+    name : str
+        The name of the generated function
+    n_blades : int
+        The number of basis blades, ``2**n``
+    table :
+        Entries ``(i, j, k, coef)``, meaning that the product of blades ``i``
+        and ``j`` contributes ``coef`` times blade ``k``.  Entries with a
+        zero coefficient are skipped.
+    exact : bool
+        If true, coefficients which are not integers are kept as sympy
+        expressions, for use with arrays of ``dtype=object`` holding sympy
+        expressions, and may be symbolic.  Otherwise they must be numbers,
+        and are converted to floats.
+    """
+    import numpy as np
+
+    columns: Dict[int, List[str]] = {}
+    constants = {}
+    used_a = set()
+    used_b = set()
+    for i, j, k, coef in table:
+        if coef == 0:
+            continue
+        if not exact and not coef.is_number:
+            raise ValueError(
+                "Cannot generate a numeric kernel for the symbolic coefficient {}".format(coef))
+        product = 'a{} * b{}'.format(i, j)
+        if isinstance(coef, Integer):
+            value = int(coef)
+            if abs(value) != 1:
+                product = '{} * {}'.format(abs(value), product)
+            sign = '-' if value < 0 else '+'
+        else:
+            const = '_c{}'.format(len(constants))
+            constants[const] = coef if exact else float(coef)
+            product = '{} * {}'.format(const, product)
+            sign = '+'
+        columns.setdefault(k, []).append('{} {}'.format(sign, product))
+        used_a.add(i)
+        used_b.add(j)
+
+    lines = [
+        'def {}(A, B):'.format(name),
+        '    A = np.asarray(A)',
+        '    B = np.asarray(B)',
+        '    if A.shape[-1:] != ({0},) or B.shape[-1:] != ({0},):'.format(n_blades),
+        '        raise ValueError("Expected arrays with {} blade coefficients along the last axis")'.format(n_blades),
+    ]
+    lines += ['    a{0} = A[..., {0}]'.format(i) for i in sorted(used_a)]
+    lines += ['    b{0} = B[..., {0}]'.format(j) for j in sorted(used_b)]
+    dtype_args = 'A, B, float' if constants and not exact else 'A, B'
+    lines.append(
+        '    out = np.zeros(np.broadcast_shapes(A.shape[:-1], B.shape[:-1]) + ({},), '
+        'dtype=np.result_type({}))'.format(n_blades, dtype_args))
+    for k in sorted(columns):
+        expr = ' '.join(columns[k])
+        if expr.startswith('+ '):
+            expr = expr[2:]
+        lines.append('    out[..., {}] = {}'.format(k, expr))
+    lines.append('    return out')
+    source = '\n'.join(lines) + '\n'
+
+    namespace = dict(constants, np=np)
+    exec(compile(source, '<galgebra {} kernel>'.format(name), 'exec'), namespace)
+    f = namespace[name]
+    f.source = source
+    return f
@@ -0,0 +1,93 @@
+"""
+A content-addressed on-disk cache for expensive construction artifacts.
+
+The cache is enabled by setting the ``GALGEBRA_CACHE_DIR`` environment
+variable to a directory.  Each entry is a pickled dictionary stored under the
+hash of everything it depends on, so entries never need to be invalidated,
+and concurrent writers of the same entry produce identical files.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Optional
+
+import sympy
+
+from .._version import __version__
+
+__all__ = ['ENV_VAR', 'cache_dir', 'make_key', 'load', 'store']
+
+ENV_VAR = 'GALGEBRA_CACHE_DIR'
+
+# bump this when the layout of stored entries changes
+_FORMAT_VERSION = 2
+
+
+def cache_dir() -> Optional[str]:
+    """ The cache directory, or ``None`` if caching is disabled """
+    return os.environ.get(ENV_VAR) or None
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Hash ``parts`` into a key.
+
+    ``parts`` should be canonical strings, such as the output of
+    :func:`sympy.srepr`.  The galgebra and sympy versions are always included,
+    as pickles are not portable between them.
+    """
+    h = hashlib.sha256()
+    h.update(repr((_FORMAT_VERSION, __version__, sympy.__version__) + parts).encode())
+    return h.hexdigest()
+
+
+def _path(key: str) -> Optional[str]:
+    directory = cache_dir()
+    if directory is None:
+        return None
+    return os.path.join(directory, key + '.pickle')
+
+
+def load(key: str) -> Optional[Dict[str, Any]]:
+    """ Load the entry stored under `key`, or return ``None`` if there is none """
+    path = _path(key)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        # missing, truncated, or written by an incompatible version
+        return None
+
+
+def store(key: str, data: Dict[str, Any]) -> bool:
+    """
+    Store `data` under `key`, returning whether this succeeded.
+
+    Failures are not errors, as some sympy objects (such as undefined
+    functions) cannot be pickled.
+    """
+    path = _path(key)
+    if path is None:
+        return False
+    try:
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file and rename, so that readers never see a
+        # partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return False
+    return True
@@ -106,7 +106,7 @@ class Sdop(_BaseDop):
 
     def simplify(self, modes=simplify):
         return Sdop([
-            (metric.apply_function_list(modes, coef), pdiff)
+            (metric.simplify_coef(coef, modes), pdiff)
             for coef, pdiff in self.terms
         ])
 
@@ -4,15 +4,18 @@ Geometric Algebra (inherits Metric)
 import warnings
 import operator
 import copy
-from itertools import combinations
-from functools import reduce
+import time
+import weakref
+from itertools import combinations, product
+from functools import reduce, partial, wraps
+from collections.abc import Mapping, MutableMapping
 from typing import Tuple, TypeVar, Callable, Dict, Sequence, List, Optional, Union
 from ._backports.typing import OrderedDict
 
 from sympy import (
     diff, Symbol, S, Mul, Add, Expr,
     expand, simplify, eye, trigsimp,
-    symbols, sqrt, Matrix,
+    symbols, sqrt, Matrix, srepr,
 )
 
 from . import printer
@@ -24,6 +27,8 @@ from .atoms import (
     BasisBaseSymbol, BasisBladeSymbol, BasisBladeNoWedgeSymbol,
 )
 from ._utils import cached_property as _cached_property
+from ._utils import disk_cache as _disk_cache
+from ._utils import codegen as _codegen
 
 # This file does not and should not use these.
 # Unfortunately, some of our examples do.
@@ -52,6 +57,8 @@ def is_bases_product(w):
 _K = TypeVar('_K')
 _V = TypeVar('_V')
 
+_not_found = object()
+
 
 class lazy_dict(Dict[_K, _V]):
     """
@@ -62,6 +69,10 @@ class lazy_dict(Dict[_K, _V]):
     result is then added to the dictionary so that ``self.f_value`` is not
     used to evaluate the same key again.
 
+    The dictionary can be shared between threads.  If several threads look
+    up the same missing key at once they may each evaluate it, but only the
+    first result is stored, and all of them return that result.
+
     Parameters
     ----------
     d :
@@ -69,14 +80,102 @@ class lazy_dict(Dict[_K, _V]):
         a regular dictionary
     f_value : function
         The function to call to generate a value for a given key
+    maxsize :
+        The maximum number of entries, see :attr:`maxsize`
+
+    Attributes
+    ----------
+    misses : int
+        The number of times ``self.f_value`` has been called
+    compute_time : float
+        The total time in seconds spent in ``self.f_value``
+    hits : int or None
+        The number of lookups of existing keys, if :attr:`count_hits` is set
     """
-    def __init__(self, d, f_value):
+    def __init__(self, d, f_value, maxsize: Optional[int] = None):
         dict.__init__(self, d)
         self.f_value = f_value
+        self.hits: Optional[int] = None
+        self.reset_stats()
+        self._maxsize = None
+        self._tracked = False
+        self.maxsize = maxsize
+
+    def reset_stats(self) -> None:
+        """ Reset :attr:`misses`, :attr:`compute_time` and :attr:`hits` to zero """
+        self.misses = 0
+        self.compute_time = 0.0
+        if self.hits is not None:
+            self.hits = 0
+
+    @property
+    def count_hits(self) -> bool:
+        """
+        Whether to count :attr:`hits`.  This makes every lookup slower, so is
+        off by default.
+        """
+        return self.hits is not None
+
+    @count_hits.setter
+    def count_hits(self, count_hits: bool) -> None:
+        if count_hits != self.count_hits:
+            self.hits = 0 if count_hits else None
+        self._update_tracked()
+
+    def _update_tracked(self) -> None:
+        # whether lookups of existing keys need to be seen, to count them or
+        # to keep the entries in order of use
+        self._tracked = self._maxsize is not None or self.hits is not None
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """
+        The maximum number of entries, or ``None`` for no limit.
+
+        When a new entry would exceed the limit, the least recently used
+        entries are evicted, and are evaluated again if they are needed.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: Optional[int]) -> None:
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be None or a non-negative integer")
+        self._maxsize = maxsize
+        self._update_tracked()
+        self._evict()
+
+    def _evict(self) -> None:
+        if self._maxsize is None:
+            return
+        while len(self) > self._maxsize:
+            try:
+                del self[next(iter(self))]
+            except (KeyError, RuntimeError, StopIteration):
+                # another thread changed the dictionary, try again
+                continue
+
+    def __getitem__(self, key: _K) -> _V:
+        if not self._tracked:
+            return dict.__getitem__(self, key)
+        value = dict.get(self, key, _not_found)
+        if value is _not_found:
+            return self.__missing__(key)
+        if self.hits is not None:
+            self.hits += 1
+        if self._maxsize is not None:
+            # move the entry to the end, as the most recently used
+            dict.pop(self, key, None)
+            value = self.setdefault(key, value)
+        return value
 
     def __missing__(self, key: _K) -> _V:
+        start = time.perf_counter()
         value = self.f_value(key)
-        self[key] = value
+        self.compute_time += time.perf_counter() - start
+        self.misses += 1
+        value = self.setdefault(key, value)
+        self._evict()
         return value
 
     def __repr__(self):
@@ -93,6 +192,51 @@ class lazy_dict(Dict[_K, _V]):
             p.text('f_value={}'.format(self.f_value))
 
 
+class _BladeTableView(MutableMapping):
+    """
+    The table of a :class:`BladeProductFunction` keyed by pairs of basis
+    blades, with the products as expressions.
+
+    This holds no entries of its own, but reads and writes those of
+    :attr:`BladeProductFunction.table_terms`.
+    """
+    def __init__(self, prod_fn: 'BladeProductFunction'):
+        self._prod_fn = prod_fn
+
+    def _key(self, key: Tuple[Symbol, Symbol]) -> Tuple[int, int]:
+        masks = self._prod_fn._ga._blade_bitmasks
+        blade1, blade2 = key
+        return masks[blade1], masks[blade2]
+
+    def __getitem__(self, key: Tuple[Symbol, Symbol]) -> Expr:
+        blades = self._prod_fn._ga._bitmask_blades
+        terms = self._prod_fn.table_terms[self._key(key)]
+        return Add(*[coef * blades[mask] for mask, coef in terms])
+
+    def __setitem__(self, key: Tuple[Symbol, Symbol], value: Expr) -> None:
+        self._prod_fn.table_terms[self._key(key)] = tuple(self._prod_fn._ga._terms_of(value).items())
+
+    def __delitem__(self, key: Tuple[Symbol, Symbol]) -> None:
+        del self._prod_fn.table_terms[self._key(key)]
+
+    def __contains__(self, key) -> bool:
+        try:
+            return self._key(key) in self._prod_fn.table_terms
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        blades = self._prod_fn._ga._bitmask_blades
+        for mask1, mask2 in list(self._prod_fn.table_terms):
+            yield blades[mask1], blades[mask2]
+
+    def __len__(self) -> int:
+        return len(self._prod_fn.table_terms)
+
+    def __repr__(self):
+        return '<{} of {!r}>'.format(type(self).__qualname__, self._prod_fn)
+
+
 def update_and_substitute(expr1, expr2, mul_dict):
     """
     Linear expand expr1 and expr2 to get (summation convention)::
@@ -113,11 +257,20 @@ def update_and_substitute(expr1, expr2, mul_dict):
     """
     coefs1, bases1 = metric.linear_expand(expr1)
     coefs2, bases2 = metric.linear_expand(expr2)
-    expr = S.Zero
+    # group by the products of bases, so the sum is built only once
+    acc = metric._TermAccumulator()
     for coef1, base1 in zip(coefs1, bases1):
         for coef2, base2 in zip(coefs2, bases2):
-            expr += coef1 * coef2 * mul_dict[base1, base2]
-    return expr
+            acc.add(mul_dict[base1, base2], coef1 * coef2)
+    return acc.as_expr()
+
+
+def _group_by_grade(terms, grade_of):
+    """ Group `terms` into lists keyed by ``grade_of(term)``, preserving order """
+    groups = {}
+    for term in terms:
+        groups.setdefault(grade_of(term), []).append(term)
+    return groups
 
 
 def nc_subs(expr, base_keys, base_values=None):
@@ -126,30 +279,113 @@ def nc_subs(expr, base_keys, base_values=None):
     value in base_values for nc key.  This was written since standard
     sympy subs was very slow in performing this operation for non-commutative
     keys for long lists of keys.
+
+    `base_keys` can be a mapping from keys to values, which is used directly
+    and is the fastest option, an iterable of ``(key, value)`` pairs, or an
+    iterable of keys with the values passed separately as `base_values`.
     """
-    if base_values is None:
-        [base_keys, base_values] = list(zip(*base_keys))
+    if base_values is not None:
+        base_map = dict(zip(base_keys, base_values))
+    elif isinstance(base_keys, Mapping):
+        base_map = base_keys
+    else:
+        base_map = dict(base_keys)
 
     if expr.is_commutative:
         return expr
-    if isinstance(expr, Add):
-        args = expr.args
-    else:
-        args = [expr]
-    s = S.Zero
-    for term in args:
+    # substitute every term in one pass, and build the sum once at the end
+    terms = []
+    for term in Add.make_args(expr):
         if term.is_commutative:
-            s += term
+            terms.append(term)
         else:
             c, nc = term.args_cnc(split_1=False)
             key = Mul._from_args(nc)
-            coef = Mul._from_args(c)
-            if key in base_keys:
-                base = base_values[base_keys.index(key)]
-                s += coef * base
+            base = base_map.get(key)
+            if base is not None:
+                terms.append(Mul._from_args(c) * base)
             else:
-                s += term
-    return s
+                terms.append(term)
+    return Add(*terms)
+
+
+def _bitmask_reorder_sign(mask1: int, mask2: int) -> int:
+    """
+    Sign picked up when reordering the basis vectors of the blade ``mask1``
+    followed by those of the blade ``mask2`` into ascending order.
+
+    Each basis blade is represented as an integer with bit ``i`` set if basis
+    vector ``i`` is a factor.  Every pair of a vector in ``mask1`` with a
+    vector in ``mask2`` that has a lower index needs one swap.
+    """
+    mask1 >>= 1
+    swaps = 0
+    while mask1:
+        swaps += (mask1 & mask2).bit_count()
+        mask1 >>= 1
+    return -1 if swaps & 1 else 1
+
+
+def _bitmask_metric_coef(mask1: int, mask2: int, squares) -> Expr:
+    """
+    Coefficient of the blade ``mask1 ^ mask2`` in the geometric product of the
+    blades ``mask1`` and ``mask2`` of an orthogonal frame, whose vectors square
+    to ``squares``.
+    """
+    result = S(_bitmask_reorder_sign(mask1, mask2))
+    common = mask1 & mask2
+    i = 0
+    while common:
+        if common & 1:
+            result *= squares[i]
+        common >>= 1
+        i += 1
+    return result
+
+
+def _outermorphism_terms(M: Matrix, n: int) -> Dict[int, Dict[int, Expr]]:
+    """
+    The outermorphism of the linear map with matrix `M` applied to each basis
+    blade, as a dictionary from the bitmask of the blade to the nonzero
+    coefficients of its image keyed by bitmask.  These coefficients are
+    the minors of `M`.
+    """
+    result = {0: {0: S.One}}
+    for grade in range(1, n + 1):
+        for cols in combinations(range(n), grade):
+            image = {}
+            for rows in combinations(range(n), grade):
+                minor = expand(M.extract(list(rows), list(cols)).det())
+                if minor != S.Zero:
+                    image[sum(1 << i for i in rows)] = minor
+            result[sum(1 << i for i in cols)] = image
+    return result
+
+
+def _disk_cached(getter):
+    """
+    Decorate the getter of an expensive artifact of a non-orthogonal algebra,
+    so that its value is stored in the disk cache when it is first computed,
+    and loaded from there by later processes instead of being computed.
+
+    The getter is a method of :class:`Ga`, or of an object with a ``_ga``
+    attribute, and should be wrapped in a ``_cached_property``.
+    """
+    name = getter.__qualname__
+
+    @wraps(getter)
+    def wrapper(self):
+        ga = self if isinstance(self, Ga) else self._ga
+        if ga.is_ortho or ga._orthogonalize or _disk_cache.cache_dir() is None:
+            return getter(self)
+        key = _disk_cache.make_key(ga._disk_cache_key, name)
+        data = _disk_cache.load(key)
+        if data is not None:
+            return data['value']
+        value = getter(self)
+        _disk_cache.store(key, dict(value=value))
+        return value
+    return wrapper
 
 
 _T = TypeVar('_T')
@@ -200,6 +436,68 @@ class OrderedBiMap(OrderedDict[_K, _V]):
         self.inverse.inverse = self
 
 
+class CayleyTable:
+    """
+    A dense table of the products of pairs of basis blades, for algebras in
+    which every such product is a multiple of a single basis blade.
+
+    Blades are identified by their position in :attr:`Ga.blades.flat <Ga.blades>`,
+    and each attribute is a NumPy array of shape ``(2**n, 2**n)``.
+
+    Attributes
+    ----------
+    targets : numpy.ndarray
+        ``targets[i, j]`` is the position of the blade that the product of
+        blades ``i`` and ``j`` is a multiple of, or ``-1`` if the product is
+        zero.  An array of ``numpy.intp``.
+    signs : numpy.ndarray
+        ``signs[i, j]`` is the sign of the coefficient of that blade, ``1``
+        or ``-1``, or ``0`` if the product is zero.  An array of ``numpy.int8``.
+    coefs : numpy.ndarray
+        ``coefs[i, j]`` is the magnitude of the coefficient of that blade as
+        a sympy number, or zero.  These are all one unless the metric has
+        diagonal entries other than 1 and -1.  An array of ``dtype=object``.
+    """
+    def __init__(self, targets, signs, coefs):
+        self.targets = targets
+        self.signs = signs
+        self.coefs = coefs
+
+    def __repr__(self):
+        return '<{} of {} blades>'.format(type(self).__qualname__, len(self.targets))
+
+
+# algebras constructed with ``intern=True``, by :attr:`Ga._intern_key`
+_interned_algebras: 'weakref.WeakValueDictionary[Tuple[str, bool], Ga]' = weakref.WeakValueDictionary()
+
+# the copy of the algebra in a worker process of :meth:`Ga.precompute`
+_precompute_worker_ga: Optional['Ga'] = None
+
+
+def _init_precompute_worker(bases, kwargs, basic_mul_table) -> None:
+    global _precompute_worker_ga
+    ga = Ga(bases, **kwargs)
+    if basic_mul_table is not None:
+        ga.basic_mul.table_dict = basic_mul_table
+    _precompute_worker_ga = ga
+
+
+def _precompute_bases_row(i: int) -> List[Expr]:
+    ga = _precompute_worker_ga
+    bases = ga.bases.flat
+    return [ga.basic_mul.of_basis_bases(bases[i], base2) for base2 in bases]
+
+
+def _precompute_blades_row(i: int) -> List[Tuple[Tuple[Tuple[int, Expr], ...], ...]]:
+    ga = _precompute_worker_ga
+    masks = [ga._blade_bitmasks[blade] for blade in ga.blades.flat]
+    products = [getattr(ga, name) for name in Ga._blade_product_names]
+    return [
+        tuple(prod_fn.table_terms[masks[i], mask2] for prod_fn in products)
+        for mask2 in masks
+    ]
+
+
 class ProductFunction:
     def __init__(self, ga):
         self._ga = ga
@@ -220,12 +518,146 @@ class BladeProductFunction(ProductFunction):
         raise NotImplementedError  # pragma: no cover
 
     @_cached_property
-    def table_dict(self) -> lazy_dict[Tuple[Symbol, Symbol], Expr]:
-        """ A cache of the result of :meth:`of_basis_blades` """
-        return lazy_dict({}, f_value=lambda b: self.of_basis_blades(*b))
+    def table_dict(self) -> MutableMapping[Tuple[Symbol, Symbol], Expr]:
+        """
+        The result of :meth:`of_basis_blades`, computed when first needed.
+
+        This is a view of :attr:`table_terms`, which holds the cached
+        products, so reading and writing it reads and writes that table.
+        """
+        return _BladeTableView(self)
+
+    @_cached_property
+    def cayley_table(self) -> CayleyTable:
+        """
+        A dense :class:`CayleyTable` of :meth:`of_basis_blades`.
+
+        Building it also fills every entry of :attr:`table_terms`.  Only
+        available for orthogonal algebras with a numeric metric, where each
+        product of basis blades is a multiple of a single blade.
+
+        Requires NumPy.
+        """
+        ga = self._ga
+        if not (ga.is_ortho and ga._g_is_fully_numeric):
+            raise ValueError("Cayley tables are only available for orthogonal algebras with a numeric metric")
+        import numpy as np
+
+        masks = [ga._blade_bitmasks[blade] for blade in ga.blades.flat]
+        positions = {mask: i for i, mask in enumerate(masks)}
+        shape = (len(masks), len(masks))
+        targets = np.full(shape, -1, dtype=np.intp)
+        signs = np.zeros(shape, dtype=np.int8)
+        coefs = np.full(shape, S.Zero, dtype=object)
+        for i, mask1 in enumerate(masks):
+            for j, mask2 in enumerate(masks):
+                for mask, coef in self.table_terms[mask1, mask2]:
+                    targets[i, j] = positions[mask]
+                    signs[i, j] = -1 if coef < 0 else 1
+                    coefs[i, j] = abs(coef)
+        return CayleyTable(targets, signs, coefs)
+
+    def _of_expr_pairs(self, pairs) -> Expr:
+        """ Sum the products of pairs of ``(coefficient, blade)`` terms """
+        table = self.table_terms
+        masks = self._ga._blade_bitmasks
+        blades = self._ga._bitmask_blades
+        acc = metric._TermAccumulator()
+        for (coef1, blade1), (coef2, blade2) in pairs:
+            coef12 = coef1 * coef2
+            mask1, mask2 = masks.get(blade1), masks.get(blade2)
+            if mask1 is None or mask2 is None:
+                # products of bases, which :attr:`Ga.mul` also accepts, are
+                # not cached as they are already in the table of :attr:`Ga.basic_mul`
+                terms = self._ga._terms_of(self.of_basis_blades(blade1, blade2)).items()
+            else:
+                terms = table[mask1, mask2]
+            for mask, coef in terms:
+                acc.add(blades[mask], coef12 * coef)
+        return acc.as_expr()
+
+    @_cached_property
+    def table_terms(self) -> lazy_dict[Tuple[int, int], Tuple[Tuple[int, Expr], ...]]:
+        """
+        A cache of the result of :meth:`of_basis_blades`, keyed by pairs of
+        blade bitmasks, with each product split into ``(bitmask, coefficient)``
+        pairs.  :attr:`table_dict` is a view of this table.
+        """
+        blades = self._ga._bitmask_blades
+        return lazy_dict({}, f_value=lambda m: tuple(
+            self._ga._terms_of(self.of_basis_blades(blades[m[0]], blades[m[1]])).items()
+        ))
+
+    def of_terms(self, A: Dict[int, Expr], B: Dict[int, Expr]) -> Dict[int, Expr]:
+        """
+        Perform the multiplication on blade representations stored as
+        dictionaries of coefficients, as produced by :meth:`Ga._terms_of`.
+
+        Unlike :meth:`__call__`, this does not need to expand and split its
+        arguments, and produces a result in the same canonical form.
+        """
+        table = self.table_terms
+        acc = metric._TermAccumulator()
+        pairs = self._term_pairs(A.items(), B.items(), lambda term: term[0].bit_count())
+        for (mask1, coef1), (mask2, coef2) in pairs:
+            coef12 = coef1 * coef2
+            for mask, coef in table[mask1, mask2]:
+                acc.add(mask, coef12 * coef)
+        return metric._canonical_terms(acc.coefs())
+
+    def _term_pairs(self, terms1, terms2, grade_of):
+        """
+        Iterate over the pairs of terms of the two operands whose product may
+        be nonzero, where ``grade_of(term)`` gives the grade of a term.
+        """
+        return product(terms1, terms2)
+
+    def numpy_kernel(self, exact: bool = False) -> Callable:
+        """
+        A vectorized NumPy implementation of this product.
+
+        The returned function takes two arrays of shape ``(..., 2**n)``,
+        holding coefficients of the blades in :attr:`Ga.blades` ``.flat``
+        order, and returns the coefficients of their products, broadcasting
+        over the leading axes.  It is generated from :attr:`table_terms` with
+        the structural zeros removed and the signs folded into the constants,
+        and is kept with the other caches of the algebra, see
+        :meth:`Ga.set_cache_limits`.
+
+        Requires NumPy.
+
+        Parameters
+        ----------
+        exact : bool
+            Keep non-integer constants as sympy expressions, for use on arrays
+            of ``dtype=object``.  This also allows symbolic metrics.  By
+            default constants are converted to floats, which requires a
+            metric whose entries are all numbers.
+        """
+        return self._numpy_kernels[exact]
+
+    @_cached_property
+    def _numpy_kernels(self) -> lazy_dict[bool, Callable]:
+        return lazy_dict({}, f_value=self._build_numpy_kernel)
+
+    def _build_numpy_kernel(self, exact: bool) -> Callable:
+        ga = self._ga
+        if not exact and not ga._g_is_fully_numeric:
+            raise ValueError("Inexact NumPy kernels are only available for algebras with a numeric metric")
+        masks = [ga._blade_bitmasks[blade] for blade in ga.blades.flat]
+        positions = {mask: i for i, mask in enumerate(masks)}
+        table = (
+            (i1, i2, positions[mask], coef)
+            for i1, mask1 in enumerate(masks)
+            for i2, mask2 in enumerate(masks)
+            for mask, coef in self.table_terms[mask1, mask2]
+        )
+        name = type(self).__name__.strip('_')
+        return _codegen.product_kernel(name, len(masks), table, exact=exact)
 
     def __call__(self, A: Expr, B: Expr) -> Expr:
-        return update_and_substitute(A, B, self.table_dict)
+        return self._of_expr_pairs(self._term_pairs(
+            metric.linear_expand_terms(A), metric.linear_expand_terms(B), None))
 
 
 class _SingleGradeProductFunction(BladeProductFunction):
@@ -241,51 +673,47 @@ class _SingleGradeProductFunction(BladeProductFunction):
         """
         raise NotImplementedError
 
+    def _may_be_nonzero(self, grade1: int, grade2: int) -> bool:
+        """
+        Whether this product of a blade of `grade1` and one of `grade2` can be
+        nonzero at all
+        """
+        grade = self._result_grade(grade1, grade2)
+        if grade is None:
+            return False
+        # the geometric product of an r-vector and an s-vector only has
+        # grades |r - s|, |r - s| + 2, ..., min(r + s, 2n - r - s)
+        return (
+            abs(grade1 - grade2) <= grade <= min(grade1 + grade2, 2 * self._ga.n - grade1 - grade2)
+            and (grade1 + grade2 - grade) % 2 == 0
+        )
+
+    def _term_pairs(self, terms1, terms2, grade_of):
+        # bucket both operands by grade, so that pairs of grades which cannot
+        # contribute are skipped without visiting their terms
+        groups1 = _group_by_grade(terms1, grade_of)
+        groups2 = _group_by_grade(terms2, grade_of)
+        for grade1, group1 in groups1.items():
+            for grade2, group2 in groups2.items():
+                if self._may_be_nonzero(grade1, grade2):
+                    yield from product(group1, group2)
+
     def _of_basis_blades_ortho(self, blade1: Symbol, blade2: Symbol):
         # dot (|), left (<), and right (>) products
         # dot product for orthogonal basis
-        index1 = self._ga.indexes_to_blades_dict.inverse[blade1]
-        index2 = self._ga.indexes_to_blades_dict.inverse[blade2]
-        index = list(index1 + index2)
+        mask1 = self._ga._blade_bitmasks[blade1]
+        mask2 = self._ga._blade_bitmasks[blade2]
 
-        grade = self._result_grade(len(index1), len(index2))
+        grade = self._result_grade(mask1.bit_count(), mask2.bit_count())
         if grade is None:
             return zero
 
-        n = len(index)
-        sgn = S.One
-        result = S.One
-        ordered = False
-        while n > grade:
-            ordered = True
-            i2 = 1
-            while i2 < n:
-                i1 = i2 - 1
-                index1 = index[i1]
-                index2 = index[i2]
-                if index1 == index2:
-                    n -= 2
-                    if n < grade:
-                        return zero
-                    result *= self._ga.g[index1, index1]
-                    index = index[:i1] + index[i2 + 1:]
-                elif index1 > index2:
-                    ordered = False
-                    index[i1] = index2
-                    index[i2] = index1
-                    sgn = -sgn
-                    i2 += 1
-                else:
-                    i2 += 1
-            if ordered:
-                break
-        if n > grade:
+        # for an orthogonal basis the geometric product of two basis blades is
+        # a single blade, so it either has the selected grade or contributes
+        # nothing
+        if (mask1 ^ mask2).bit_count() != grade:
             return zero
-        else:
-            if index == []:
-                return sgn * result
-            else:
-                return sgn * result * self._ga.indexes_to_blades_dict[tuple(index)]
+        return self._ga._ortho_bitmask_mul(mask1, mask2)
 
     def _of_basis_blades_non_ortho(self, blade1: Symbol, blade2: Symbol) -> Expr:
         # dot product of basis blades if basis vectors are non-orthogonal
@@ -294,22 +722,19 @@ class _SingleGradeProductFunction(BladeProductFunction):
         grade1 = self._ga.blades_to_grades_dict[blade1]
         grade2 = self._ga.blades_to_grades_dict[blade2]
 
-        grade = self._result_grade(grade1, grade2)
-        if grade is None:
+        if not self._may_be_nonzero(grade1, grade2):
             return zero
+        grade = self._result_grade(grade1, grade2)
 
-        # Need base rep for blades since that is all we can multiply
-        base1 = self._ga.blade_expansion_dict[blade1]
-        base2 = self._ga.blade_expansion_dict[blade2]
-
-        # geometric product of basis blades
-        base12 = self._ga.mul(base1, base2)
-        # blade rep of geometric product
-        blade12 = self._ga.base_to_blade_rep(base12)
-        # decompose geometric product by grades
-        grade_dict = self._ga.grade_decomposition(blade12)
-
-        return grade_dict.get(grade, zero)
+        # select the grade from the geometric product of the blades, which
+        # shares the table of :attr:`Ga.mul`
+        terms = self._ga.mul.table_terms[
+            self._ga._blade_bitmasks[blade1], self._ga._blade_bitmasks[blade2]]
+        return Add(*[
+            coef * self._ga._bitmask_blades[mask]
+            for mask, coef in terms
+            if mask.bit_count() == grade
+        ])
 
     def of_basis_blades(self, blade1: Symbol, blade2: Symbol) -> Expr:
         if self._ga.is_ortho:
@@ -318,7 +743,10 @@ class _SingleGradeProductFunction(BladeProductFunction):
             return self._of_basis_blades_non_ortho(blade1, blade2)
 
     def __call__(self, A: Expr, B: Expr) -> Expr:
-        return update_and_substitute(A, B, self.table_dict)
+        grades = self._ga.blades_to_grades_dict
+        return self._of_expr_pairs(self._term_pairs(
+            metric.linear_expand_terms(A), metric.linear_expand_terms(B),
+            lambda term: grades[term[1]]))
 
 
 class _HestenesDotFunction(_SingleGradeProductFunction):
@@ -360,48 +788,26 @@ class _WedgeProductFunction(_SingleGradeProductFunction):
     def of_basis_blades(self, blade1: Symbol, blade2: Symbol) -> Expr:
         # outer (^) product of basis blades
         # this method works for both orthogonal and non-orthogonal basis
-        index1 = self._ga.indexes_to_blades_dict.inverse[blade1]
-        index2 = self._ga.indexes_to_blades_dict.inverse[blade2]
-        index12 = list(index1 + index2)
-
-        grade = self._result_grade(len(index1), len(index2))
-        if grade is None:
-            return zero
+        mask1 = self._ga._blade_bitmasks[blade1]
+        mask2 = self._ga._blade_bitmasks[blade2]
 
-        sgn, wedge12 = Ga.blade_reduce(index12)
-        if sgn != 0:
-            return sgn * self._ga.indexes_to_blades_dict[tuple(wedge12)]
-        else:
+        # a repeated basis vector makes the wedge product vanish
+        if mask1 & mask2:
             return S.Zero
 
+        sgn = _bitmask_reorder_sign(mask1, mask2)
+        return sgn * self._ga._bitmask_blades[mask1 | mask2]
+
 
 class _GeometricProductFunction(BladeProductFunction):
     def of_basis_blades(self, blade1: Symbol, blade2: Symbol) -> Expr:
         # geometric (*) product for orthogonal basis
         if self._ga.is_ortho:
-            index1 = self._ga.indexes_to_blades_dict.inverse[blade1]
-            index2 = self._ga.indexes_to_blades_dict.inverse[blade2]
-            blade_index = list(index1 + index2)
-            repeats = []
-            sgn = 1
-            for i in range(1, len(blade_index)):
-                save = blade_index[i]
-                j = i
-                while j > 0 and blade_index[j - 1] > save:
-                    sgn = -sgn
-                    blade_index[j] = blade_index[j - 1]
-                    j -= 1
-                blade_index[j] = save
-                if blade_index[j] == blade_index[j - 1]:
-                    repeats.append(save)
-            result = S(sgn)
-            for i in repeats:
-                blade_index.remove(i)
-                blade_index.remove(i)
-                result *= self._ga.g[i, i]
-            if len(blade_index) > 0:
-                result *= self._ga.indexes_to_blades_dict[tuple(blade_index)]
-            return result
+            return self._ga._ortho_bitmask_mul(
+                self._ga._blade_bitmasks[blade1], self._ga._blade_bitmasks[blade2])
+        elif self._ga._orthogonalize:
+            return self._ga._orthogonalized_bitmask_mul(
+                self._ga._blade_bitmasks[blade1], self._ga._blade_bitmasks[blade2])
         else:
             base1 = self._ga.blade_to_base_rep(blade1)
             base2 = self._ga.blade_to_base_rep(blade2)
@@ -417,6 +823,10 @@ class BaseProductFunction(ProductFunction):
 
 
 class _BaseGeometricProductFunction(BaseProductFunction):
+    # for Ga.cache_stats
+    _builds = 0
+    _build_time = 0.0
+
     def of_basis_bases(self, base1: Symbol, base2: Symbol) -> Expr:
         # geometric product of bases for non-orthogonal basis vectors
         index = self._ga.indexes_to_bases_dict.inverse[base1] + self._ga.indexes_to_bases_dict.inverse[base2]
@@ -429,17 +839,22 @@ class _BaseGeometricProductFunction(BaseProductFunction):
         ), S.Zero)
 
     @_cached_property
+    @_disk_cached
     def table_dict(self) -> OrderedDict[Mul, Expr]:
-        return OrderedDict(
+        start = time.perf_counter()
+        table = OrderedDict(
             (base1 * base2, self.of_basis_bases(base1, base2))
             for base1 in self._ga.bases.flat
             for base2 in self._ga.bases.flat
         )
+        self._build_time += time.perf_counter() - start
+        self._builds += 1
+        return table
 
     def __call__(self, A: Expr, B: Expr) -> Expr:  # geometric product (*) of base representations
         # only multiplicative operation to assume A and B are in base representation
         AxB = expand(A * B)
-        AxB = nc_subs(AxB, self.table_dict.items())
+        AxB = nc_subs(AxB, self.table_dict)
         return expand(AxB)
 
 
@@ -513,6 +928,11 @@ class Ga(metric.Metric):
     :attr:`BladeProductFunction.table_dict` attribute, which contains a lazy lookup table
     of the products of basis blades.
 
+    For algebras with a numeric metric, all of these tables can be filled
+    when the algebra is constructed by passing ``precompute=True``, or later
+    by calling :meth:`precompute`.  For orthogonal numeric metrics this also
+    builds a dense :attr:`BladeProductFunction.cayley_table` for each product.
+
     For non-orthogonal algebras, there is one additional operation, this one mapping
     bases instead of blades. Unlike the others, the ``table_dict`` attribute is
     pre-computed:
@@ -521,6 +941,21 @@ class Ga(metric.Metric):
 
         ~galgebra.ga.Ga.basic_mul
 
+    The expensive parts of constructing a non-orthogonal algebra
+    (:attr:`blade_expansion_dict`, :attr:`base_expansion_dict`, the table of
+    :attr:`basic_mul`, :attr:`r_basis`, :attr:`e_sq`, and :attr:`g_inv`) can be
+    cached on disk and shared between processes, by setting the
+    ``GALGEBRA_CACHE_DIR`` environment variable to a directory.  Each is
+    stored when it is first computed, and entries are keyed by a hash of the
+    metric, basis names, coordinates and ``norm`` setting, along with the
+    galgebra and sympy versions.
+
+    Within a single process, algebras constructed with ``intern=True`` share
+    these artifacts and the product tables with the earlier interned algebra
+    of the same basis names, metric, coordinates, ``norm`` and ``wedge``
+    setting, if it is still alive.  The algebras remain distinct, so their
+    multivectors cannot be mixed.
+
     .. rubric:: Reciprocal basis data structures
 
     .. autosummary::
@@ -533,20 +968,31 @@ class Ga(metric.Metric):
 
     .. rubric:: Derivative data structures
 
-    .. attribute:: de
+    .. autosummary::
 
-        Derivatives of basis functions.  Two dimensional list. First entry is differentiating coordinate index.
-        Second entry is basis vector index.  Quantities are linear combinations of basis vector symbols.
+        ~galgebra.ga.Ga.de
+        ~galgebra.ga.Ga.grad
+        ~galgebra.ga.Ga.rgrad
 
-    .. attribute:: grad
+    .. rubric:: Lazy construction
 
-        Geometric derivative operator from left. ``grad*F`` returns multivector
-        derivative, ``F*grad`` returns differential operator.
+    Constructing an algebra only sets up the :class:`~galgebra.metric.Metric`
+    data (the basis, :attr:`g`, :attr:`is_ortho` and the normalization), the
+    connection when ``connect_flg`` is set, and anything loaded from the disk
+    cache or requested with ``precompute=True``.  Everything else, including
+    :attr:`e`, :attr:`e_sq`, :attr:`i`, :attr:`i_inv`, :attr:`sing_flg`,
+    :attr:`de`, :attr:`grad`, :attr:`rgrad`, :attr:`r_basis` and
+    :attr:`g_inv`, is computed the first time it is used.
 
-    .. attribute:: rgrad
+    .. rubric:: Thread safety
 
-        Geometric derivative operator from right. ``rgrad*F`` returns differential
-        operator, ``F*rgrad`` returns multivector derivative.
+    An algebra can be shared between threads.  Its lazily computed
+    attributes and tables are computed without holding a lock and then
+    published with :meth:`dict.setdefault`, so threads never see a partially
+    built value, and when two threads compute the same entry at once both use
+    whichever result was stored first.  Settings such as :meth:`dual_mode`,
+    :attr:`dot_mode` and :meth:`Simp.profile <galgebra.metric.Simp.profile>`
+    are not per-thread, and should be chosen before the threads start.
 
     .. Sphinx adds all the other members below this docstring
 
@@ -652,7 +1098,8 @@ class Ga(metric.Metric):
     def __eq__(self, ga):
         return self.name == ga.name
 
-    def __init__(self, bases, *, wedge=True, **kwargs):
+    def __init__(self, bases, *, wedge=True, precompute=False, orthogonalize=False, intern=False,
+                 cache_limits=None, **kwargs):
         """
         Parameters
         ----------
@@ -660,14 +1107,35 @@ class Ga(metric.Metric):
             Passed as ``basis`` to ``Metric``.
         wedge :
             Use ``^`` symbol to print basis blades
+        precompute :
+            Compute all the product tables up front, see :meth:`precompute`.
+            Only allowed for numeric metrics.
+        orthogonalize :
+            For a numeric metric that is not diagonal, compute the products
+            of basis blades in an orthogonal frame found by congruence
+            diagonalization of the metric, instead of by expanding the blades
+            into geometric products of basis vectors.  The results are
+            the same, and are still expressed in the original basis.
+        intern :
+            Share product tables and other immutable caches with an earlier
+            algebra constructed with ``intern=True`` and the same structure.
+        cache_limits :
+            A dictionary of limits on the number of entries in each cache,
+            passed on to :meth:`set_cache_limits`.
         **kwargs :
             See :class:`galgebra.metric.Metric`.
         """
 
         self.wedge_print = wedge
+        # used to rebuild the algebra in worker processes
+        self._init_args = (bases, dict(kwargs, wedge=wedge, orthogonalize=orthogonalize))
 
         metric.Metric.__init__(self, bases, **kwargs)
 
+        if orthogonalize and not self.is_ortho and not self._g_is_fully_numeric:
+            raise ValueError("Only a numeric metric can be orthogonalized")
+        self._orthogonalize = orthogonalize and not self.is_ortho
+
         self.par_coords = None
 
         if self.debug:
@@ -678,42 +1146,22 @@ class Ga(metric.Metric):
         if self.coords is not None:
             self.coords = list(self.coords)
 
-        self.e = mv.Mv(self.blades.flat[-1], ga=self)  # Pseudo-scalar for geometric algebra
-
-        if self.coords is not None:
-            self._update_de_from_rbasis()
-            self._build_grads()
+        # reuse the caches of an identical algebra in this process
+        if intern:
+            peer = _interned_algebras.setdefault(self._intern_key, self)
+            if peer is self:
+                peer = None
+            else:
+                self._share_caches(peer)
 
         if self.connect_flg:
             self._build_connection()
 
-        # Calculate normalized pseudo scalar (I**2 = +/-1)
-
-        self.sing_flg = False
-
-        if self.e_sq.is_number:
-            if self.e_sq == S.Zero:
-                self.sing_flg = True
-                print('!!!!If I**2 = 0, I cannot be normalized!!!!')
-                # raise ValueError('!!!!If I**2 = 0, I cannot be normalized!!!!')
-            if self.e_sq > S.Zero:
-                self.i = self.e/sqrt(self.e_sq)
-                self.i_inv = self.i
-            else:  # I**2 = -1
-                self.i = self.e/sqrt(-self.e_sq)
-                self.i_inv = -self.i
-        else:
-            if self.Isq == '+':  # I**2 = 1
-                self.i = self.e/sqrt(self.e_sq)
-                self.i_inv = self.i
-            else:  # I**2 = -1
-                self.i = self.e/sqrt(-self.e_sq)
-                self.i_inv = -self.i
-
         if self.debug:
             print('Exit Ga.__init__()')
 
-        self._agrads = {}  # cache of gradient operator with respect to vector a
+        # cache of gradient operator with respect to vector a
+        self._agrads = lazy_dict({}, f_value=lambda key: self._make_grad(*key))
         self.dslot = -1  # args slot for dervative, -1 for coordinates
 
         # mystery state used by the Mlt class
@@ -721,8 +1169,290 @@ class Ga(metric.Metric):
         self._mlt_acoefs = []  # List of dummy vectors coefficients
         self._mlt_pdiffs = []  # List of lists dummy vector coefficients
 
-        if self.n > 0:
-            self._XOX = self.mv('XOX', 'vector')  # cached vector for use in is_versor
+        if cache_limits:
+            self.set_cache_limits(**cache_limits)
+
+        if precompute:
+            self.precompute()
+
+    @_cached_property
+    def _disk_cache_key(self) -> str:
+        return _disk_cache.make_key(
+            'Ga', srepr(self.g), [str(b.name) for b in self.basis],
+            srepr(self.coords), self.norm, self.gsym, self.wedge_print,
+        )
+
+    @_cached_property
+    def _intern_key(self) -> Tuple[str, bool]:
+        return self._disk_cache_key, self._orthogonalize
+
+    # lazily filled tables, which are shared outright by interned algebras
+    _interned_lazy_dicts = ('_normal_order', '_normal_insert', '_reciprocal_blade_dict')
+    _interned_product_tables = ('table_terms', '_numpy_kernels')
+    # values which are copied if the earlier interned algebra has computed them
+    _interned_values = (
+        'blade_expansion_dict', 'base_expansion_dict', 'r_basis', 'e_sq', 'g_inv', '_orthogonal_frame',
+    )
+
+    _blade_product_names = ('mul', 'wedge', 'hestenes_dot', 'scalar_product', 'left_contract', 'right_contract')
+
+    def _share_caches(self, peer: 'Ga') -> None:
+        """ Share the caches of `peer`, which has the same :attr:`_intern_key` """
+        for name in self._interned_lazy_dicts:
+            setattr(self, name, getattr(peer, name))
+        for name in self._interned_values:
+            if name in vars(peer):
+                setattr(self, name, getattr(peer, name))
+        if 'basic_mul' in vars(peer) and 'table_dict' in vars(peer.basic_mul):
+            self.basic_mul.table_dict = peer.basic_mul.table_dict
+        for name in self._blade_product_names:
+            prod_fn, peer_prod_fn = getattr(self, name), getattr(peer, name)
+            for table in self._interned_product_tables:
+                setattr(prod_fn, table, getattr(peer_prod_fn, table))
+            if 'cayley_table' in vars(peer_prod_fn):
+                prod_fn.cayley_table = peer_prod_fn.cayley_table
+
+    @_cached_property
+    def _g_is_fully_numeric(self) -> bool:
+        # unlike `g_is_numeric`, this also checks the diagonal
+        return all(x.is_number for x in self.g)
+
+    def precompute(self, workers: Optional[int] = None) -> None:
+        """
+        Fill the product tables of :attr:`mul`, :attr:`wedge`,
+        :attr:`hestenes_dot`, :attr:`left_contract`, :attr:`right_contract`,
+        and :attr:`scalar_product` for every pair of basis blades.
+
+        This fills each lazy :attr:`BladeProductFunction.table_terms`, and for
+        orthogonal algebras also builds the dense
+        :attr:`BladeProductFunction.cayley_table` of each product if NumPy is
+        installed.
+
+        If the disk cache is enabled, the filled tables are stored in it, and
+        later calls for the same algebra load them instead.
+
+        Parameters
+        ----------
+        workers :
+            Fill the tables in a pool of this many processes, which is
+            worthwhile for algebras of high dimension.  Each process rebuilds
+            the algebra from the arguments it was constructed with, so these
+            must be picklable.  For non-orthogonal algebras the table of
+            :attr:`basic_mul` is also split between the processes.
+        """
+        if not self._g_is_fully_numeric:
+            raise ValueError("Product tables can only be precomputed for a numeric metric")
+        products = [getattr(self, name) for name in self._blade_product_names]
+        if not self._load_disk_cached_tables():
+            if workers is not None:
+                self._precompute_in_processes(workers)
+            masks = [self._blade_bitmasks[blade] for blade in self.blades.flat]
+            for prod_fn in products:
+                for mask1 in masks:
+                    for mask2 in masks:
+                        prod_fn.table_terms[mask1, mask2]
+            self._store_disk_cached_tables()
+        if self.is_ortho:
+            try:
+                import numpy  # noqa: F401
+            except ImportError:
+                return
+            for prod_fn in products:
+                prod_fn.cayley_table
+
+    def _precompute_in_processes(self, workers: int) -> None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        bases, kwargs = self._init_args
+        kwargs = dict(kwargs, precompute=False, intern=False, debug=False)
+
+        basic_mul_table = None
+        if not self.is_ortho and not self._orthogonalize:
+            if 'table_dict' not in vars(self.basic_mul):
+                with ProcessPoolExecutor(workers, initializer=_init_precompute_worker,
+                                         initargs=(bases, kwargs, None)) as pool:
+                    rows = pool.map(_precompute_bases_row, range(len(self.bases.flat)))
+                    self.basic_mul.table_dict = OrderedDict(
+                        (base1 * base2, value)
+                        for base1, row in zip(self.bases.flat, rows)
+                        for base2, value in zip(self.bases.flat, row)
+                    )
+            basic_mul_table = self.basic_mul.table_dict
+
+        products = [getattr(self, name) for name in self._blade_product_names]
+        masks = [self._blade_bitmasks[blade] for blade in self.blades.flat]
+        with ProcessPoolExecutor(workers, initializer=_init_precompute_worker,
+                                 initargs=(bases, kwargs, basic_mul_table)) as pool:
+            rows = pool.map(_precompute_blades_row, range(len(masks)))
+            for mask1, row in zip(masks, rows):
+                for mask2, values in zip(masks, row):
+                    for prod_fn, value in zip(products, values):
+                        prod_fn.table_terms[mask1, mask2] = value
+
+    def _cache_dicts(self) -> Dict[str, List[lazy_dict]]:
+        """
+        The lazily filled caches of this algebra, by the names used in
+        :meth:`cache_stats`.  The names before any ``.`` are those used in
+        :meth:`set_cache_limits`.
+        """
+        caches = {}
+        for name in self._blade_product_names:
+            prod_fn = getattr(self, name)
+            caches[name] = [prod_fn.table_terms]
+        caches['numpy_kernels'] = [getattr(self, name)._numpy_kernels for name in self._blade_product_names]
+        caches['normal_order'] = [self._normal_order]
+        caches['normal_order.insert'] = [self._normal_insert]
+        caches['reciprocal_blades'] = [self._reciprocal_blade_dict]
+        caches['agrads'] = [self._agrads]
+        if self.connect_flg:
+            caches['dbases'] = [self._dbases]
+            caches['connect'] = list(self.connect.values())
+        return caches
+
+    def set_cache_limits(self, **limits: Optional[int]) -> None:
+        """
+        Limit the number of entries in the caches of this algebra.
+
+        When a cache is full, its least recently used entries are evicted, and
+        are computed again if they are needed.  A limit of ``None`` removes
+        the limit.  The caches are:
+
+        ``mul``, ``wedge``, ``hestenes_dot``, ``scalar_product``, ``left_contract``, ``right_contract``
+            The tables of products of basis blades, such as
+            :attr:`BladeProductFunction.table_terms`
+        ``normal_order``
+            The normal ordering of products of basis vectors, used for
+            non-orthogonal metrics
+        ``reciprocal_blades``
+            The reciprocal of each basis blade
+        ``agrads``
+            The gradient operators of :meth:`make_grad`
+        ``numpy_kernels``
+            The kernels of :meth:`BladeProductFunction.numpy_kernel`, limited
+            for each product
+        ``dbases``, ``connect``
+            The derivatives and connections of basis blades, only for
+            algebras with a connection
+
+        Caches shared with interned algebras are limited for all of them.
+        """
+        caches = self._cache_dicts()
+        groups = [name for name in caches if '.' not in name]
+        for name in limits:
+            if name not in groups:
+                raise ValueError("Unknown cache {!r}, expected one of {}".format(name, groups))
+        for full_name, group_caches in caches.items():
+            name = full_name.split('.')[0]
+            if name in limits:
+                for cache in group_caches:
+                    cache.maxsize = limits[name]
+
+    def clear_caches(self) -> None:
+        """
+        Empty the caches listed in :meth:`set_cache_limits`, and drop the
+        dense :attr:`BladeProductFunction.cayley_table` and the table of
+        :attr:`basic_mul`.
+
+        Everything is computed again when it is next needed.  Caches shared
+        with interned algebras are emptied for all of them.
+        """
+        for caches in self._cache_dicts().values():
+            for cache in caches:
+                cache.clear()
+        for name in self._blade_product_names:
+            vars(getattr(self, name)).pop('cayley_table', None)
+        if 'basic_mul' in vars(self):
+            vars(self.basic_mul).pop('table_dict', None)
+
+    def count_cache_hits(self, enable: bool = True) -> None:
+        """
+        Count the hits reported by :meth:`cache_stats`.
+
+        This makes every lookup in the caches slightly slower, so is off by
+        default.
+        """
+        for caches in self._cache_dicts().values():
+            for cache in caches:
+                cache.count_hits = enable
+
+    def cache_stats(self, reset: bool = False) -> Dict[str, Dict[str, Union[int, float, None]]]:
+        """
+        Statistics for each cache of this algebra, as a plain dictionary.
+
+        For each cache this reports
+
+        ``entries``
+            The number of entries
+        ``maxsize``
+            The limit set by :meth:`set_cache_limits`, or ``None``
+        ``hits``
+            The number of lookups of existing entries, or ``None`` unless
+            :meth:`count_cache_hits` has been called
+        ``misses``
+            The number of entries computed
+        ``compute_time``
+            The total time in seconds spent computing entries.  This
+            includes the time spent filling other caches, such as the
+            ``mul`` table used to fill ``hestenes_dot`` when the algebra is
+            constructed with ``orthogonalize=True``.
+
+        The caches are those of :meth:`set_cache_limits`, with the table used
+        to build ``normal_order`` one basis vector at a time reported
+        separately as ``normal_order.insert``.  For non-orthogonal algebras, there
+        is also the table of :attr:`basic_mul`, which is built all at once
+        and so counts a single miss.  The counts are approximate if the
+        algebra is used from several threads at once.
+
+        Parameters
+        ----------
+        reset :
+            Reset the counts after reporting them
+        """
+        stats = {}
+        for name, caches in self._cache_dicts().items():
+            hits = [cache.hits for cache in caches]
+            stats[name] = dict(
+                entries=sum(len(cache) for cache in caches),
+                maxsize=caches[0].maxsize,
+                hits=None if None in hits else sum(hits),
+                misses=sum(cache.misses for cache in caches),
+                compute_time=sum(cache.compute_time for cache in caches),
+            )
+            if reset:
+                for cache in caches:
+                    cache.reset_stats()
+        if not self.is_ortho and not self._orthogonalize:
+            basic_mul = self.basic_mul
+            built = 'table_dict' in vars(basic_mul)
+            stats['basic_mul'] = dict(
+                entries=len(basic_mul.table_dict) if built else 0,
+                maxsize=None,
+                hits=None,
+                misses=basic_mul._builds,
+                compute_time=basic_mul._build_time,
+            )
+            if reset:
+                basic_mul._builds = 0
+                basic_mul._build_time = 0.0
+        return stats
+
+    def _load_disk_cached_tables(self) -> bool:
+        if _disk_cache.cache_dir() is None:
+            return False
+        data = _disk_cache.load(_disk_cache.make_key('tables', self._intern_key))
+        if data is None:
+            return False
+        for name in self._blade_product_names:
+            getattr(self, name).table_terms.update(data[name])
+        return True
+
+    def _store_disk_cached_tables(self) -> None:
+        if _disk_cache.cache_dir() is None:
+            return
+        _disk_cache.store(_disk_cache.make_key('tables', self._intern_key), {
+            name: dict(getattr(self, name).table_terms)
+            for name in self._blade_product_names
+        })
 
     @_cached_property
     def coord_vec(self) -> Expr:
@@ -766,20 +1496,14 @@ class Ga(metric.Metric):
             # Convert to a multivector.
             a = sum((ai * ei for ai, ei in zip(a, self.mv_basis)), self.mv(S.Zero))
 
-        cache_key = (a, cmpflg)
+        return self._agrads[a, cmpflg]
 
-        if cache_key in self._agrads:
-            return self._agrads[cache_key]
-
-        # make the grad and cache it
-        grad_a = mv.Dop([
+    def _make_grad(self, a: _mv.Mv, cmpflg: bool) -> mv.Dop:
+        return mv.Dop([
             (self.mv(self._reciprocal_blade_dict[base]), dop.Pdop({coef: 1}))
             for coef, base in metric.linear_expand_terms(a.obj)
         ], ga=self, cmpflg=cmpflg)
 
-        self._agrads[cache_key] = grad_a
-        return grad_a
-
     def __str__(self):
         return self.name
 
@@ -937,7 +1661,11 @@ class Ga(metric.Metric):
 
         return {key: val for key, val in zip(var_names, bl)}
 
-    def _build_grads(self) -> None:
+    @_cached_property
+    def _grads(self) -> Tuple[_mv.Dop, _mv.Dop]:
+        if self.coords is None:
+            raise ValueError("Ga must have been initialized with coords to compute grads")
+
         if not self.is_ortho:
             r_basis = [x / self.e_sq for x in self.r_basis_mv]
         else:
@@ -947,13 +1675,26 @@ class Ga(metric.Metric):
 
         pdx = [dop.Pdop(x) for x in self.coords]
 
-        self.grad = mv.Dop(r_basis, pdx, ga=self)
-        self.rgrad = mv.Dop(r_basis, pdx, ga=self, cmpflg=True)
+        return mv.Dop(r_basis, pdx, ga=self), mv.Dop(r_basis, pdx, ga=self, cmpflg=True)
+
+    @_cached_property
+    def grad(self) -> _mv.Dop:
+        """
+        Geometric derivative operator from left. ``grad*F`` returns multivector
+        derivative, ``F*grad`` returns differential operator.
+        """
+        return self._grads[0]
+
+    @_cached_property
+    def rgrad(self) -> _mv.Dop:
+        """
+        Geometric derivative operator from right. ``rgrad*F`` returns differential
+        operator, ``F*rgrad`` returns multivector derivative.
+        """
+        return self._grads[1]
 
     def grads(self) -> Tuple[_mv.Dop, _mv.Dop]:
-        if self.coords is None:
-            raise ValueError("Ga must have been initialized with coords to compute grads")
-        return self.grad, self.rgrad
+        return self._grads
 
     def pdop(self, *args, **kwargs) -> _dop.Pdop:
         """ Shorthand to construct a :class:`~galgebra.dop.Pdop` """
@@ -1098,6 +1839,91 @@ class Ga(metric.Metric):
             for blade in grade
         }
 
+    @_cached_property
+    def _blade_bitmasks(self) -> Dict[Symbol, int]:
+        """ Map from basis blades to bitmasks, where bit ``i`` is set if ``basis[i]`` is a factor """
+        return {
+            blade: sum(1 << i for i in index)
+            for index, blade in self.indexes_to_blades_dict.items()
+        }
+
+    @_cached_property
+    def _blade_positions(self) -> Dict[Symbol, int]:
+        """ Map from basis blades to their position in :attr:`blades` ``.flat`` """
+        return {blade: i for i, blade in enumerate(self.blades.flat)}
+
+    @_cached_property
+    def _bitmask_blades(self) -> Dict[int, Symbol]:
+        """ Inverse of :attr:`_blade_bitmasks` """
+        return {mask: blade for blade, mask in self._blade_bitmasks.items()}
+
+    def _ortho_bitmask_mul(self, mask1: int, mask2: int) -> Expr:
+        """
+        Geometric product of two basis blades given as bitmasks, for an
+        orthogonal basis.
+
+        The basis vectors shared by both blades square to their diagonal
+        metric entries, and the remaining ones form the result blade.
+        """
+        squares = [self.g[i, i] for i in self.n_range]
+        return _bitmask_metric_coef(mask1, mask2, squares) * self._bitmask_blades[mask1 ^ mask2]
+
+    @_cached_property
+    def _orthogonal_frame(self) -> Tuple[List[Expr], Dict[int, Dict[int, Expr]], Dict[int, Dict[int, Expr]]]:
+        """
+        An orthogonal frame for a numeric metric that is not diagonal, used
+        when the algebra is created with ``orthogonalize=True``.
+
+        Returns the squares of the frame vectors, the coefficients of each
+        basis blade in terms of the blades of the frame, and the coefficients
+        of each blade of the frame in terms of the basis blades.  The latter
+        two are keyed by blade bitmask, as in :meth:`_terms_of`.
+        """
+        P, squares = metric._congruence_diagonalize(self.g)
+        return squares, _outermorphism_terms(P.inv(), self.n), _outermorphism_terms(P, self.n)
+
+    def _orthogonalized_bitmask_mul(self, mask1: int, mask2: int) -> Expr:
+        """
+        Geometric product of two basis blades given as bitmasks, computed in
+        the orthogonal frame of :attr:`_orthogonal_frame`.
+        """
+        squares, to_frame, from_frame = self._orthogonal_frame
+        frame_acc = metric._TermAccumulator()
+        for frame_mask1, coef1 in to_frame[mask1].items():
+            for frame_mask2, coef2 in to_frame[mask2].items():
+                frame_acc.add(
+                    frame_mask1 ^ frame_mask2,
+                    coef1 * coef2 * _bitmask_metric_coef(frame_mask1, frame_mask2, squares))
+        acc = metric._TermAccumulator()
+        for frame_mask, frame_coef in frame_acc.coefs().items():
+            for mask, coef in from_frame[frame_mask].items():
+                acc.add(mask, frame_coef * coef)
+        return self._expr_of_terms(metric._canonical_terms(acc.coefs()))
+
+    def _terms_of(self, A: Expr) -> Dict[int, Expr]:
+        """
+        Split a blade representation into a dictionary mapping the bitmasks of
+        basis blades (see :attr:`_blade_bitmasks`) to their coefficients.
+
+        Coefficients are expanded, and zero coefficients are left out, so the
+        result is canonical.
+        """
+        masks = self._blade_bitmasks
+        return {
+            masks[blade]: coef
+            for coef, blade in metric.linear_expand_terms(A)
+            if coef != S.Zero
+        }
+
+    def _expr_of_terms(self, terms: Dict[int, Expr]) -> Expr:
+        """ Inverse of :meth:`_terms_of`, building a flat sum of monomials times blades """
+        blades = self._bitmask_blades
+        return Add(*[
+            term * blades[mask]
+            for mask, coef in terms.items()
+            for term in Add.make_args(coef)
+        ])
+
     @_cached_property
     def bases(self) -> GradedTuple[Symbol]:
         r""" Bases (non-commutative sympy symbols) by grade.
@@ -1252,12 +2078,15 @@ class Ga(metric.Metric):
     def _build_connection(self):
         # Partial derivatives of multivector bases multiplied (*,^,|,<,>)
         # on left and right (True and False) by reciprocal basis vectors.
-        self.connect = {('*', True): [], ('^', True): [], ('|', True): [],
-                        ('<', True): [], ('>', True): [], ('*', False): [],
-                        ('^', False): [], ('|', False): [], ('<', False): [],
-                        ('>', False): []}
+        # Each is keyed by the basis blade, as the connection does not depend
+        # on the reciprocal basis vector it is requested for.
+        self.connect = {
+            (mode, left): lazy_dict({}, f_value=partial(self._connection, mode=mode, left=left))
+            for left in [True, False]
+            for mode in ['*', '^', '|', '<', '>']
+        }
         # Partial derivatives of multivector bases
-        self._dbases = {}
+        self._dbases = lazy_dict({}, f_value=lambda key: self._blade_derivation(*key))
 
     ######## Functions for Calculation products of blades/bases ########
 
@@ -1272,9 +2101,8 @@ class Ga(metric.Metric):
 
     def reduce_basis(self, blst):
         r"""
-        Repetitively applies :meth:`reduce_basis_loop` to `blst`
-        product representation until normal form is
-        realized for non-orthogonal basis
+        Reduce the geometric product of the basis vectors with indices `blst`
+        to normal form for non-orthogonal basis
 
         If the basis vectors are represented by the non-
         commutative symbols :math:`e_1,...,e_n` then a grade :math:`r` base
@@ -1297,46 +2125,59 @@ class Ga(metric.Metric):
         tensor of the vector space.  This also allows one to calculate
         the geometric product of any two bases and grade of the
         geometric algebra, and form the multiplication table.
+
+        The reductions of every suffix of `blst` are memoized on the algebra,
+        so building the multiplication table only reduces each word once.
+        The single steps of the reduction are performed by
+        :meth:`reduce_basis_loop`.
         """
-        blst = list(blst)
-        if blst == []:  # blst represents scalar
-            blst_coef = [1]
-            blst_expand = [[]]
-            return blst_coef, blst_expand
-        blst_expand = [blst]
-        blst_coef = [1]
-        blst_flg = [False]
-        # reduce untill all blst revise flgs are True
-        while not reduce(operator.and_, blst_flg):
-            for i in range(len(blst_flg)):
-                if not blst_flg[i]:  # keep revising if revise flg is False
-                    tmp = Ga.reduce_basis_loop(self.g, blst_expand[i])
-                    if isinstance(tmp, bool):
-                        blst_flg[i] = tmp  # revision of blst_expand[i] complete
-                    elif len(tmp) == 3:  # blst_expand[i] contracted
-                        blst_coef[i] = tmp[0] * blst_coef[i]
-                        blst_expand[i] = tmp[1]
-                        blst_flg[i] = tmp[2]
-                    else:  # blst_expand[i] revised
-                        blst_coef[i] = -blst_coef[i]
-                        # if revision force one more pass in case revision
-                        # causes repeated index previous to revised pair of
-                        # indexes
-                        blst_flg[i] = False
-                        blst_expand[i] = tmp[3]
-                        blst_coef.append(-blst_coef[i] * tmp[0])
-                        blst_expand.append(tmp[1])
-                        blst_flg.append(tmp[2])
-        new_blst_coef = []
-        new_blst_expand = []
-        for coef, xpand in zip(blst_coef, blst_expand):
-            if xpand in new_blst_expand:
-                i = new_blst_expand.index(xpand)
-                new_blst_coef[i] += coef
-            else:
-                new_blst_expand.append(xpand)
-                new_blst_coef.append(coef)
-        return new_blst_coef, new_blst_expand
+        terms = self._normal_order[tuple(blst)]
+        if not terms:
+            return [S.Zero], [[]]
+        return list(terms.values()), [list(index) for index in terms.keys()]
+
+    @_cached_property
+    def _normal_order(self) -> lazy_dict[Tuple[int, ...], Dict[Tuple[int, ...], Expr]]:
+        """
+        The normal form of the geometric product of the basis vectors with
+        the given indices, as a dictionary from ordered index tuples to
+        nonzero coefficients.
+        """
+        def reduce_word(word):
+            if len(word) <= 1:
+                return {word: S.One}
+            # reduce the tail, then move the first vector into place
+            acc = metric._TermAccumulator()
+            for tail, coef in self._normal_order[word[1:]].items():
+                for index, insert_coef in self._normal_insert[word[0], tail].items():
+                    acc.add(index, coef * insert_coef)
+            return metric._canonical_terms(acc.coefs())
+
+        return lazy_dict({}, f_value=reduce_word)
+
+    @_cached_property
+    def _normal_insert(self) -> lazy_dict[Tuple[int, Tuple[int, ...]], Dict[Tuple[int, ...], Expr]]:
+        r"""
+        The normal form of :math:`e_i e_{j_1} \cdots e_{j_r}`, keyed by
+        ``(i, (j_1, ..., j_r))`` where :math:`j_1 < \ldots < j_r`.
+        """
+        def insert(key):
+            i, word = key
+            if not word or i < word[0]:
+                return {(i,) + word: S.One}
+            j = word[0]
+            rest = word[1:]
+            if i == j:
+                return {rest: self.g[i, i]}
+            # e_i e_j = 2 (e_j . e_i) - e_j e_i, and e_j goes in front of every
+            # term of e_i e_rest since j is smaller than i and all of rest
+            acc = metric._TermAccumulator()
+            acc.add(rest, 2 * self.g[j, i])
+            for index, coef in self._normal_insert[i, rest].items():
+                acc.add((j,) + index, -coef)
+            return metric._canonical_terms(acc.coefs())
+
+        return lazy_dict({}, f_value=insert)
 
     @staticmethod
     def reduce_basis_loop(g, blst):
@@ -1495,6 +2336,7 @@ class Ga(metric.Metric):
         return self.basic_mul.of_basis_bases(*base12)
 
     @_cached_property
+    @_disk_cached
     def blade_expansion_dict(self) -> OrderedDict[Symbol, Expr]:
         """ dictionary expanding blade basis in terms of base basis """
 
@@ -1521,6 +2363,7 @@ class Ga(metric.Metric):
         return blade_expansion_dict
 
     @_cached_property
+    @_disk_cached
     def base_expansion_dict(self) -> OrderedDict[Symbol, Expr]:
         """ dictionary expanding base basis in terms of blade basis """
         base_expansion_dict = OrderedDict()
@@ -1562,7 +2405,7 @@ class Ga(metric.Metric):
             return A
         else:
             # return expand(A).subs(self.base_expansion_dict)
-            return nc_subs(expand(A), self.base_expansion_dict.items())
+            return nc_subs(expand(A), self.base_expansion_dict)
 
     def blade_to_base_rep(self, A):
 
@@ -1570,7 +2413,7 @@ class Ga(metric.Metric):
             return A
         else:
             # return expand(A).subs(self.blade_expansion_dict)
-            return nc_subs(expand(A), self.blade_expansion_dict.items())
+            return nc_subs(expand(A), self.blade_expansion_dict)
 
     ###### Products (*,^,|,<,>) for multivector representations ########
 
@@ -1637,6 +2480,14 @@ class Ga(metric.Metric):
             raise ValueError('"' + str(self.dot_mode) + '" not a legal mode in dot')
         return self.Mul(A, B, mode=self.dot_mode)
 
+    def sandwich(self, V: _mv.Mv, X: _mv.Mv) -> _mv.Mv:
+        """
+        Apply the versor `V` to `X`.  Equivalent to :meth:`galgebra.mv.Mv.sandwich`.
+        """
+        if V.Ga != self:
+            raise ValueError('In sandwich the versor is not from this geometric algebra')
+        return V.sandwich(X)
+
     ######################## Helper Functions ##########################
 
     def grade_decomposition(self, A: _MaybeMv) -> Dict[int, _MaybeMv]:
@@ -1655,20 +2506,10 @@ class Ga(metric.Metric):
             Aobj = expand(A.obj)
         else:
             Aobj = A
-        coefs, blades = metric.linear_expand(Aobj)
-        grade_dict = {}
-        for coef, blade in zip(coefs, blades):
-            if blade == S.One:
-                if 0 in list(grade_dict.keys()):
-                    grade_dict[0] += coef
-                else:
-                    grade_dict[0] = coef
-            else:
-                grade = self.blades_to_grades_dict[blade]
-                if grade in grade_dict:
-                    grade_dict[grade] += coef * blade
-                else:
-                    grade_dict[grade] = coef * blade
+        acc = metric._TermAccumulator()
+        for coef, blade in metric.linear_expand_terms(Aobj):
+            acc.add(self.blades_to_grades_dict[blade], coef * blade)
+        grade_dict = acc.coefs()
         if isinstance(A, mv.Mv):
             for grade in list(grade_dict.keys()):
                 grade_dict[grade] = self.mv(grade_dict[grade])
@@ -1768,7 +2609,6 @@ class Ga(metric.Metric):
 
     def reverse(self, A: Expr) -> Expr:  # Calculates reverse of A (see documentation)
         A = expand(A)
-        blades = {}
         if isinstance(A, Add):
             args = A.args
         else:
@@ -1776,27 +2616,19 @@ class Ga(metric.Metric):
                 return A
             else:
                 args = [A]
+        # accumulate the terms by the sign reversal gives them
+        acc = metric._TermAccumulator()
         for term in args:
             if term.is_commutative:
-                if 0 in blades:
-                    blades[0] += term
-                else:
-                    blades[0] = term
+                acc.add(S.One, term)
             else:
                 _c, nc = term.args_cnc()
-                blade = nc[0]
-                grade = self.blades_to_grades_dict[blade]
-                if grade in blades:
-                    blades[grade] += term
+                grade = self.blades_to_grades_dict[nc[0]]
+                if (grade * (grade - 1)) // 2 % 2 == 0:
+                    acc.add(S.One, term)
                 else:
-                    blades[grade] = term
-        s = S.Zero
-        for grade in blades:
-            if (grade * (grade - 1)) / 2 % 2 == 0:
-                s += blades[grade]
-            else:
-                s -= blades[grade]
-        return s
+                    acc.add(S.NegativeOne, term)
+        return acc.as_expr()
 
     def get_grade(self, A: Expr, r: int) -> Expr:  # Return grade r of A, <A>_{r}
         coefs, bases = metric.linear_expand(A)
@@ -1814,22 +2646,23 @@ class Ga(metric.Metric):
             args = A.args
         else:
             args = [A]
-        s = S.Zero
+        acc = metric._TermAccumulator()
         for term in args:
             if term.is_commutative:
                 if even:
-                    s += term
+                    acc.add(S.One, term)
             else:
                 c, nc = term.args_cnc(split_1=False)
                 blade = nc[0]
                 grade = self.blades_to_grades_dict[blade]
                 if even and grade % 2 == 0:
-                    s += Mul._from_args(c) * blade
+                    acc.add(blade, Mul._from_args(c))
                 elif not even and grade % 2 == 1:
-                    s += Mul._from_args(c) * blade
-        return s
+                    acc.add(blade, Mul._from_args(c))
+        return acc.as_expr()
 
     @_cached_property
+    @_disk_cached
     def e_sq(self) -> Expr:
         r"""
         If ``self.gsym = True`` then :math:`E_{n}^2` is not evaluated, but is represented
@@ -1845,9 +2678,51 @@ class Ga(metric.Metric):
         else:
             return simplify(expand((self.e*self.e).scalar()))
 
+    @_cached_property
+    def e(self) -> _mv.Mv:
+        """ The unnormalized pseudoscalar, :math:`E_n` """
+        return mv.Mv(self.blades.flat[-1], ga=self)
+
+    @_cached_property
+    def sing_flg(self) -> bool:
+        """ True if the pseudoscalar squares to zero, so cannot be normalized """
+        return bool(self.e_sq.is_number and self.e_sq == S.Zero)
+
+    @_cached_property
+    def _normalized_pseudoscalar(self) -> Tuple[_mv.Mv, _mv.Mv]:
+        # Calculate normalized pseudo scalar (I**2 = +/-1)
+        if self.e_sq.is_number:
+            if self.sing_flg:
+                print('!!!!If I**2 = 0, I cannot be normalized!!!!')
+                # raise ValueError('!!!!If I**2 = 0, I cannot be normalized!!!!')
+            if self.e_sq > S.Zero:
+                i = self.e/sqrt(self.e_sq)
+                return i, i
+            else:  # I**2 = -1
+                i = self.e/sqrt(-self.e_sq)
+                return i, -i
+        else:
+            if self.Isq == '+':  # I**2 = 1
+                i = self.e/sqrt(self.e_sq)
+                return i, i
+            else:  # I**2 = -1
+                i = self.e/sqrt(-self.e_sq)
+                return i, -i
+
+    @_cached_property
+    def i(self) -> _mv.Mv:
+        r""" The normalized pseudoscalar, :math:`I` with :math:`I^2 = \pm 1` """
+        return self._normalized_pseudoscalar[0]
+
+    @_cached_property
+    def i_inv(self) -> _mv.Mv:
+        """ The inverse of the normalized pseudoscalar :attr:`i` """
+        return self._normalized_pseudoscalar[1]
+
     ##################### Multivector derivatives ######################
 
     @_cached_property
+    @_disk_cached
     def r_basis(self) -> List[Expr]:
         r"""
         Reciprocal basis vectors :math:`e^{j}` as linear combination of basis vector symbols.
@@ -1881,7 +2756,11 @@ class Ga(metric.Metric):
             sgn = 1
             r_basis = []
             for dual in duals:
-                dual_base_rep = self.blade_to_base_rep(dual)
+                if self._orthogonalize:
+                    # blades can be multiplied directly in the orthogonal frame
+                    dual_base_rep = dual
+                else:
+                    dual_base_rep = self.blade_to_base_rep(dual)
                 # {E_n}^{-1} = \frac{E_n}{{E_n}^{2}}
                 # r_basis_j = sgn * duals[j] * E_n so it's not normalized, missing a factor of {E_n}^{-2}
                 """
@@ -1889,7 +2768,10 @@ class Ga(metric.Metric):
                 print('debug =', expand(self.base_to_blade_rep(self.mul(sgn * dual_base_rep, self.e.obj))))
                 print('collect arg =', expand(self.base_to_blade_rep(self.mul(sgn * dual_base_rep, self.e.obj))))
                 """
-                r_basis_j = metric.collect(expand(self.base_to_blade_rep(self.mul(sgn * dual_base_rep, self.e.obj))), self.blades.flat)
+                r_basis_j = self.mul(sgn * dual_base_rep, self.e.obj)
+                if not self._orthogonalize:
+                    r_basis_j = self.base_to_blade_rep(r_basis_j)
+                r_basis_j = metric.collect(expand(r_basis_j), self.blades.flat)
                 r_basis.append(r_basis_j)
                 # sgn = (-1)**{j-1}
                 sgn = -sgn
@@ -1907,10 +2789,16 @@ class Ga(metric.Metric):
 
         return r_basis
 
-    def _update_de_from_rbasis(self):
+    @_cached_property
+    def de(self) -> Optional[List[List[Expr]]]:
+        """
+        Derivatives of basis functions.  Two dimensional list. First entry is differentiating coordinate index.
+        Second entry is basis vector index.  Quantities are linear combinations of basis vector symbols.
+        ``None`` if the algebra has no coordinates.
+        """
         # Replace reciprocal basis vectors with expansion in terms of
         # basis vectors in derivatives of basis vectors.
-        de = self.de
+        de = self._de
         if de is not None:
             for x_i in self.n_range:
                 for jb in self.n_range:
@@ -1918,8 +2806,10 @@ class Ga(metric.Metric):
                         de[x_i][jb] = metric.Simp.apply(de[x_i][jb].subs(self.r_basis_dict) / self.e_sq)
                     else:
                         de[x_i][jb] = metric.Simp.apply(de[x_i][jb].subs(self.r_basis_dict))
+        return de
 
     @_cached_property
+    @_disk_cached
     def g_inv(self) -> Matrix:
         """ inverse of metric tensor, g^{ij} """
         g_inv = eye(self.n)
@@ -1995,10 +2885,10 @@ class Ga(metric.Metric):
             coord = ib
             ib = self.coords.index(coord)
 
-        key = (coord, blade)
-        if key in self._dbases:
-            return self._dbases[key]
+        return self._dbases[coord, blade]
 
+    def _blade_derivation(self, coord: Symbol, blade: Symbol) -> Expr:
+        ib = self.coords.index(coord)
         index = self.indexes_to_blades_dict.inverse[blade]
         grade = len(index)
 
@@ -2010,7 +2900,6 @@ class Ga(metric.Metric):
                 self.de[ib][index[i]],
                 self.indexes_to_blades_dict[index[i + 1:]]
             ])
-        self._dbases[key] = db
         return db
 
     def pDiff(self, A: _mv.Mv, coord: Union[List, Symbol]) -> _mv.Mv:
@@ -2119,22 +3008,15 @@ class Ga(metric.Metric):
         ``*``, ``^``, ``|``, ``<``, or ``>`` depending upon the mode, and
         :math:`e^{j}` are reciprocal basis vectors.
         """
-        mode_key = (mode, left)
-        keys = [i for i, j in self.connect[mode_key]]
-        if left:
-            key = rbase * key_base
-        else:
-            key = key_base * rbase
-        if key not in keys:
-            keys.append(key)
-            C = S.Zero
-            for ib in self.n_range:
-                x = self.blade_derivation(key_base, ib)
-                if self.norm:
-                    x /= self.e_norm[ib]
-                C += self.er_blade(self.r_basis[ib], x, mode, left)
-            # Update connection dictionaries
-            self.connect[mode_key].append((key, C))
+        return self.connect[mode, left][key_base]
+
+    def _connection(self, key_base, mode, left):
+        C = S.Zero
+        for ib in self.n_range:
+            x = self.blade_derivation(key_base, ib)
+            if self.norm:
+                x /= self.e_norm[ib]
+            C += self.er_blade(self.r_basis[ib], x, mode, left)
         return C
 
     def ReciprocalFrame(self, basis: Sequence[_mv.Mv], mode: str = 'norm') -> Tuple[_mv.Mv, ...]:
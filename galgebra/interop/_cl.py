@@ -56,6 +56,11 @@ def Cl(p: int, q: int = 0, r: int = 0, root: str = 'e', **kwargs):
     Projective Geometric Algebra::
 
         >>> ga, e1, e2, e3 = Cl(2, 0, 1)
+
+    Repeated calls can share their product tables, rather than each
+    starting from scratch::
+
+        >>> ga, e1, e2, e3, e4, e5 = Cl(4, 1, intern=True)
     """
     n = p + q + r
     if n == 0:
@@ -0,0 +1,329 @@
+"""
+Deferred evaluation of multivector expressions.
+
+Operators on a :class:`LazyMv` record a graph of operations instead of
+computing a result.  The graph is only evaluated when coefficients, printing
+or comparison are requested, and grade projections are pushed down into
+the products and sums beneath them, so that grades which are discarded are
+never computed.  For instance ``(A.lazy() * B).grade(2)`` only multiplies the
+pairs of grades of ``A`` and ``B`` which can produce a bivector.
+
+Every node caches its result, so subexpressions which appear several times
+in a graph are evaluated once.
+
+Use :meth:`galgebra.mv.Mv.lazy` to start building a graph.
+"""
+import abc
+from typing import Dict, FrozenSet, List, Tuple, TYPE_CHECKING
+
+from sympy import S, Expr
+
+from . import metric
+from .mv import Mv, _is_scalar_coef
+from ._utils import cached_property as _cached_property
+
+if TYPE_CHECKING:
+    from galgebra.ga import Ga
+
+_Terms = Dict[int, Expr]
+
+
+class LazyMv(abc.ABC):
+    """
+    A node in a graph of deferred multivector operations.
+
+    Supports ``+``, ``-``, ``*``, ``^``, ``|``, ``<``, ``>``, multiplication
+    by scalars, and the unary operations :meth:`rev`, :meth:`g_invol`,
+    :meth:`even`, :meth:`odd`, :meth:`grade` and :meth:`dual`.  The right
+    operand may be another lazy multivector, or an :class:`~galgebra.mv.Mv`;
+    a product with an :class:`~galgebra.mv.Mv` on the left is written as
+    ``A.lazy() * B``.
+
+    Products are evaluated in the order they are written; the association
+    order is not changed.
+    """
+
+    def __init__(self, ga: 'Ga', args: Tuple = ()):
+        self.Ga = ga
+        self.args = args
+        self._cache: Dict[FrozenSet[int], _Terms] = {}
+
+    # construction
+
+    def _wrap(self, A) -> 'LazyMv':
+        if isinstance(A, LazyMv):
+            node = A
+        elif isinstance(A, Mv):
+            node = _Leaf(A)
+        elif _is_scalar_coef(A):
+            node = _Leaf(Mv(A, ga=self.Ga))
+        else:
+            raise TypeError('Cannot combine a LazyMv with {!r}'.format(type(A).__name__))
+        if node.Ga != self.Ga:
+            raise ValueError('Multivectors are not from the same geometric algebra')
+        return node
+
+    def __add__(self, A):
+        return _Sum(self.Ga, ((1, self), (1, self._wrap(A))))
+
+    def __radd__(self, A):
+        return _Sum(self.Ga, ((1, self._wrap(A)), (1, self)))
+
+    def __sub__(self, A):
+        return _Sum(self.Ga, ((1, self), (-1, self._wrap(A))))
+
+    def __rsub__(self, A):
+        return _Sum(self.Ga, ((1, self._wrap(A)), (-1, self)))
+
+    def __neg__(self):
+        return _Scale(self, S.NegativeOne)
+
+    def __mul__(self, A):
+        if not isinstance(A, (LazyMv, Mv)) and _is_scalar_coef(A):
+            return _Scale(self, A)
+        return _Product(self, self._wrap(A), 'mul')
+
+    def __rmul__(self, A):
+        if not isinstance(A, (LazyMv, Mv)) and _is_scalar_coef(A):
+            return _Scale(self, A)
+        return _Product(self._wrap(A), self, 'mul')
+
+    def __truediv__(self, A):
+        if not _is_scalar_coef(A):
+            raise TypeError('A LazyMv can only be divided by a scalar')
+        return _Scale(self, S.One / A)
+
+    def __xor__(self, A):
+        return _Product(self, self._wrap(A), 'wedge')
+
+    def __rxor__(self, A):
+        return _Product(self._wrap(A), self, 'wedge')
+
+    def __or__(self, A):
+        return _Product(self, self._wrap(A), 'hestenes_dot')
+
+    def __ror__(self, A):
+        return _Product(self._wrap(A), self, 'hestenes_dot')
+
+    def __lt__(self, A):
+        return _Product(self, self._wrap(A), 'left_contract')
+
+    def __gt__(self, A):
+        return _Product(self, self._wrap(A), 'right_contract')
+
+    def rev(self) -> 'LazyMv':
+        return _GradeMap(self, lambda r: -1 if r % 4 in (2, 3) else 1)
+
+    __invert__ = rev
+
+    def g_invol(self) -> 'LazyMv':
+        return _GradeMap(self, lambda r: -1 if r % 2 else 1)
+
+    def even(self) -> 'LazyMv':
+        return _GradeMap(self, lambda r: 1 - r % 2)
+
+    def odd(self) -> 'LazyMv':
+        return _GradeMap(self, lambda r: r % 2)
+
+    def grade(self, r: int = 0) -> 'LazyMv':
+        return _GradeMap(self, lambda grade: 1 if grade == r else 0)
+
+    get_grade = grade
+
+    def __getitem__(self, r: int) -> 'LazyMv':
+        return self.grade(r)
+
+    def dual(self) -> 'LazyMv':
+        """ As :meth:`galgebra.mv.Mv.dual` """
+        mode = self.Ga.dual_mode_value
+        I = self.Ga.i_inv if 'Iinv' in mode else self.Ga.i
+        if '-' in mode:
+            I = -I
+        if mode[0] in '+-':
+            return _Product(self._wrap(I), self, 'mul')
+        else:
+            return _Product(self, self._wrap(I), 'mul')
+
+    # evaluation
+
+    @_cached_property
+    @abc.abstractmethod
+    def grades(self) -> FrozenSet[int]:
+        """ The grades this expression may have, found without evaluating it """
+
+    @abc.abstractmethod
+    def _compute(self, grades: FrozenSet[int]) -> _Terms:
+        """ Compute the blade coefficients of `grades`, which is a subset of :attr:`grades` """
+
+    def _terms(self, grades: FrozenSet[int]) -> _Terms:
+        """ The blade coefficients of the parts of the given `grades` """
+        grades = grades & self.grades
+        try:
+            return self._cache[grades]
+        except KeyError:
+            pass
+        full = self._cache.get(self.grades)
+        if full is not None:
+            terms = _filter_grades(full, grades)
+        else:
+            terms = self._compute(grades)
+        return self._cache.setdefault(grades, terms)
+
+    def evaluate(self) -> Mv:
+        """ Evaluate the expression into a multivector """
+        return Mv._from_terms(self._terms(self.grades), ga=self.Ga)
+
+    @property
+    def obj(self) -> Expr:
+        return self.evaluate().obj
+
+    def scalar(self) -> Expr:
+        return self._terms(frozenset([0])).get(0, S.Zero)
+
+    def blade_coefs(self, blade_lst=None) -> List[Expr]:
+        return self.evaluate().blade_coefs(blade_lst)
+
+    def __eq__(self, A):
+        if isinstance(A, LazyMv):
+            A = A.evaluate()
+        return self.evaluate() == A
+
+    __hash__ = None
+
+    def __str__(self):
+        return str(self.evaluate())
+
+    def __repr__(self):
+        return '<{} of grades {}>'.format(type(self).__qualname__, sorted(self.grades))
+
+    def _latex(self, printer):
+        return printer._print(self.evaluate())
+
+
+def _filter_grades(terms: _Terms, grades: FrozenSet[int]) -> _Terms:
+    return {mask: coef for mask, coef in terms.items() if mask.bit_count() in grades}
+
+
+class _Leaf(LazyMv):
+    def __init__(self, value: Mv):
+        super().__init__(value.Ga)
+        self.value = value
+
+    @_cached_property
+    def grades(self) -> FrozenSet[int]:
+        return frozenset(mask.bit_count() for mask in self.value._blade_terms())
+
+    def _compute(self, grades):
+        return _filter_grades(self.value._blade_terms(), grades)
+
+    def evaluate(self) -> Mv:
+        return self.value
+
+
+class _Sum(LazyMv):
+    @_cached_property
+    def grades(self) -> FrozenSet[int]:
+        return frozenset().union(*(arg.grades for _sign, arg in self.args))
+
+    def _compute(self, grades):
+        acc = metric._TermAccumulator()
+        for sign, arg in self.args:
+            for mask, coef in arg._terms(grades).items():
+                acc.add(mask, sign * coef)
+        return _nonzero(acc.coefs())
+
+
+class _Scale(LazyMv):
+    def __init__(self, arg: LazyMv, factor: Expr):
+        super().__init__(arg.Ga, (arg,))
+        self.factor = factor
+
+    @_cached_property
+    def grades(self) -> FrozenSet[int]:
+        if self.factor == 0:
+            return frozenset()
+        return self.args[0].grades
+
+    def _compute(self, grades):
+        return metric._canonical_terms({
+            mask: self.factor * coef
+            for mask, coef in self.args[0]._terms(grades).items()
+        })
+
+
+class _GradeMap(LazyMv):
+    """ Multiplies each grade ``r`` by ``sign_of_grade(r)``, which is 0 or +/-1 """
+    def __init__(self, arg: LazyMv, sign_of_grade):
+        super().__init__(arg.Ga, (arg,))
+        self.sign_of_grade = sign_of_grade
+
+    @_cached_property
+    def grades(self) -> FrozenSet[int]:
+        return frozenset(r for r in self.args[0].grades if self.sign_of_grade(r))
+
+    def _compute(self, grades):
+        return {
+            mask: coef if self.sign_of_grade(mask.bit_count()) == 1 else -coef
+            for mask, coef in self.args[0]._terms(grades).items()
+        }
+
+
+class _Product(LazyMv):
+    def __init__(self, A: LazyMv, B: LazyMv, product: str):
+        super().__init__(A.Ga, (A, B))
+        self.product = getattr(A.Ga, product)
+        self._geometric = product == 'mul'
+
+    def _result_grades(self, grade1: int, grade2: int) -> range:
+        """ The grades the product of blades of the given grades may have """
+        if self._geometric:
+            n = self.Ga.n
+            return range(abs(grade1 - grade2), min(grade1 + grade2, 2 * n - grade1 - grade2) + 1, 2)
+        if not self.product._may_be_nonzero(grade1, grade2):
+            return range(0)
+        grade = self.product._result_grade(grade1, grade2)
+        return range(grade, grade + 1)
+
+    @_cached_property
+    def grades(self) -> FrozenSet[int]:
+        A, B = self.args
+        return frozenset(
+            grade
+            for grade1 in A.grades
+            for grade2 in B.grades
+            for grade in self._result_grades(grade1, grade2)
+        )
+
+    def _compute(self, grades):
+        A, B = self.args
+        pairs = [
+            (grade1, grade2)
+            for grade1 in A.grades
+            for grade2 in B.grades
+            if not grades.isdisjoint(self._result_grades(grade1, grade2))
+        ]
+        # only evaluate the grades of the operands which contribute
+        groups1 = _group_by_grade(A._terms(frozenset(grade1 for grade1, _ in pairs)))
+        groups2 = _group_by_grade(B._terms(frozenset(grade2 for _, grade2 in pairs)))
+
+        table = self.product.table_terms
+        acc = metric._TermAccumulator()
+        for grade1, grade2 in pairs:
+            for mask1, coef1 in groups1.get(grade1, ()):
+                for mask2, coef2 in groups2.get(grade2, ()):
+                    coef12 = coef1 * coef2
+                    for mask, coef in table[mask1, mask2]:
+                        if mask.bit_count() in grades:
+                            acc.add(mask, coef12 * coef)
+        return metric._canonical_terms(acc.coefs())
+
+
+def _group_by_grade(terms: _Terms) -> Dict[int, List[Tuple[int, Expr]]]:
+    groups = {}
+    for mask, coef in terms.items():
+        groups.setdefault(mask.bit_count(), []).append((mask, coef))
+    return groups
+
+
+def _nonzero(terms: _Terms) -> _Terms:
+    return {mask: coef for mask, coef in terms.items() if coef != S.Zero}
@@ -337,10 +337,8 @@ class Lt(printer.GaPrintable):
         elif isinstance(mat_rep, mv.Mv):     # Versor input
             if not mat_rep.is_versor:
                 raise ValueError(mat_rep, 'is not a versor in Versor input for Lt!\n')
-            V = mat_rep
-            Vg_invol = V.g_invol()
-            Vinv = V.inv()
-            outermorphism = ga.lt(lambda x: Vg_invol * x * Vinv)
+            # V.sandwich(x) is V.g_invol() * x * V.inv() for vectors x
+            outermorphism = ga.lt(mat_rep.sandwich)
             self.lt_dict = simplify(outermorphism.lt_dict)
         # ## GSG code ends ###
 
@@ -2,9 +2,14 @@
 Metric Tensor and Derivatives of Basis Vectors.
 """
 
+import atexit
 import copy
+import threading
 import warnings
-from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import List, Optional, Tuple
 
 from sympy import (
     diff, trigsimp, Matrix, Rational,
@@ -29,6 +34,79 @@ def apply_function_list(f, x):
         return f(x)
 
 
+class _TermAccumulator:
+    """
+    Collects the terms of a linear combination grouped by key, typically a
+    basis blade.
+
+    Adding terms one at a time with ``+=`` builds a new :class:`~sympy.core.add.Add`
+    every time, which is quadratic in the number of terms.  This instead
+    keeps a list of terms per key, and only builds the sums at the end.
+    """
+    def __init__(self):
+        self._terms = {}
+
+    def add(self, key, term) -> None:
+        """ Add `term` to the coefficient of `key` """
+        terms = self._terms.get(key)
+        if terms is None:
+            self._terms[key] = [term]
+        else:
+            terms.append(term)
+
+    def coefs(self) -> dict:
+        """ The coefficient of each key, in the order keys were first added """
+        return {key: Add(*terms) for key, terms in self._terms.items()}
+
+    def as_expr(self) -> Expr:
+        """ The linear combination of the keys """
+        return Add(*[Add(*terms) * key for key, terms in self._terms.items()])
+
+
+def _is_expanded_factor(expr) -> bool:
+    """
+    Conservatively check whether `expr` is a factor of a term that
+    :func:`~sympy.core.function.expand` leaves unchanged.
+    """
+    if expr.is_Atom:
+        return True
+    if expr.is_Pow:
+        return expr.base.is_Atom and expr.exp.is_Atom
+    if expr.is_Function:
+        return all(arg.is_Atom for arg in expr.args)
+    return False
+
+
+def _is_expanded_linear(expr) -> bool:
+    """
+    Conservatively check whether `expr` is already a flat sum of monomials,
+    each with at most one non-commutative factor, so that calling
+    :func:`~sympy.core.function.expand` on it is unnecessary.
+    """
+    for term in Add.make_args(expr):
+        if term.is_Mul:
+            factors = term.args
+        else:
+            factors = (term,)
+        n_nc = 0
+        for factor in factors:
+            if not _is_expanded_factor(factor):
+                return False
+            if not factor.is_commutative:
+                n_nc += 1
+        if n_nc > 1:
+            return False
+    return True
+
+
+# The most recent results of `linear_expand`, keyed by the id of the
+# expression.  The expressions themselves are kept alive by the cache, so ids
+# cannot be reused while an entry exists.
+_linear_expand_cache = OrderedDict()
+_LINEAR_EXPAND_CACHE_SIZE = 256
+_linear_expand_lock = threading.Lock()
+
+
 def linear_expand(expr):
     """
     linear_expand takes an expression that is the sum of a scalar
@@ -38,43 +116,48 @@ def linear_expand(expr):
     noncommutatives symbols contains the scalar 1 if there is a scalar
     term in the sum and also does not contain any repeated noncommutative
     symbols.
+
+    The result for the most recently used expressions is cached, so
+    splitting the same expression object again is cheap.
     """
     if not isinstance(expr, Expr):
         raise TypeError('{!r} is not a SymPy Expr'.format(expr))
 
-    expr = expand(expr)
+    with _linear_expand_lock:
+        cached = _linear_expand_cache.get(id(expr))
+        if cached is not None and cached[0] is expr:
+            _linear_expand_cache.move_to_end(id(expr))
+    if cached is not None and cached[0] is expr:
+        _expr, coefs, bases = cached
+    else:
+        coefs, bases = _linear_expand(expr)
+        with _linear_expand_lock:
+            _linear_expand_cache[id(expr)] = (expr, coefs, bases)
+            if len(_linear_expand_cache) > _LINEAR_EXPAND_CACHE_SIZE:
+                _linear_expand_cache.popitem(last=False)
+    # callers are free to modify the lists they get
+    return (list(coefs), list(bases))
+
+
+def _linear_expand(expr):
+    if not _is_expanded_linear(expr):
+        expr = expand(expr)
 
     if expr == 0:
-        coefs = [expr]
-        bases = [S.One]
-        return (coefs, bases)
+        return ((expr,), (S.One,))
 
-    if isinstance(expr, Add):
-        args = expr.args
-    else:
-        if expr.is_commutative:
-            return ([expr], [S.One])
-        else:
-            args = [expr]
-    coefs = []
-    bases = []
-    for term in args:
+    if not isinstance(expr, Add) and expr.is_commutative:
+        return ((expr,), (S.One,))
+
+    acc = _TermAccumulator()
+    for term in Add.make_args(expr):
         if term.is_commutative:
-            if S.One in bases:
-                coefs[bases.index(S.One)] += term
-            else:
-                bases.append(S.One)
-                coefs.append(term)
+            acc.add(S.One, term)
         else:
             c, nc = term.args_cnc()
-            base = nc[0]
-            coef = Mul._from_args(c)
-            if base in bases:
-                coefs[bases.index(base)] += coef
-            else:
-                bases.append(base)
-                coefs.append(coef)
-    return (coefs, bases)
+            acc.add(nc[0], Mul._from_args(c))
+    coefs = acc.coefs()
+    return (tuple(coefs.values()), tuple(coefs.keys()))
 
 
 def linear_expand_terms(expr):
@@ -82,6 +165,19 @@ def linear_expand_terms(expr):
     return zip(coefs, bases)
 
 
+def _canonical_terms(terms):
+    """
+    Expand the coefficients of a dictionary of terms, as used by
+    :meth:`galgebra.ga.Ga._terms_of`, dropping any that vanish.
+    """
+    result = {}
+    for key, coef in terms.items():
+        coef = expand(coef)
+        if coef != S.Zero:
+            result[key] = coef
+    return result
+
+
 def collect(A, nc_list):
     """
     Parameters
@@ -298,20 +394,194 @@ def symbols_list(s, indices=None, sub=True, commutative=False):
     return [BasisVectorSymbol(s, commutative=commutative) for s in s_lst]
 
 
+def _congruence_diagonalize(g: Matrix):
+    """
+    Find an invertible matrix ``P`` such that ``P.T * g * P`` is diagonal,
+    for a symmetric matrix `g` with numeric entries.
+
+    The columns of ``P`` are the components of an orthogonal frame in the
+    basis with metric `g`.  Symmetric Gaussian elimination is used, so for a
+    metric whose leading minors are nonzero ``P`` is unit upper triangular.
+    Zero pivots, as in metrics of null bases, are handled by bringing in
+    another basis vector.
+
+    Returns ``P`` and the list of diagonal entries of ``P.T * g * P``, which
+    are the squares of the vectors of the frame.
+    """
+    n = g.rows
+    A = Matrix(g)
+    P = eye(n)
+
+    def add_multiple(j, k, c):
+        # replace basis vector j by (basis vector j) + c (basis vector k)
+        A[:, j] = (A[:, j] + c * A[:, k]).applyfunc(expand)
+        A[j, :] = (A[j, :] + c * A[k, :]).applyfunc(expand)
+        P[:, j] = (P[:, j] + c * P[:, k]).applyfunc(expand)
+
+    for k in range(n):
+        if A[k, k] == 0:
+            j = next((j for j in range(k + 1, n) if A[j, j] != 0), None)
+            if j is not None:
+                A.col_swap(k, j)
+                A.row_swap(k, j)
+                P.col_swap(k, j)
+            else:
+                j = next((j for j in range(k + 1, n) if A[k, j] != 0), None)
+                if j is None:
+                    continue  # already orthogonal to the remaining vectors
+                # both vectors are null, but their sum is not
+                add_multiple(k, j, S.One)
+        for j in range(k + 1, n):
+            if A[k, j] != 0:
+                add_multiple(j, k, -A[k, j] / A[k, k])
+
+    return P, [A[i, i] for i in range(n)]
+
+
+# The most recent results of `simplify_coefs`, keyed by the coefficient and
+# the tuple of functions applied to it.
+_simplify_cache = OrderedDict()
+_SIMPLIFY_CACHE_SIZE = 4096
+_simplify_lock = threading.Lock()
+
+# the process pool of `simplify_coefs`, and its number of workers
+_simplify_pool: Optional[Tuple[int, Executor]] = None
+
+
+def _simplify_key(coef, modes):
+    if coef.is_Atom:
+        # cheaper to simplify again than to look up
+        return None
+    key = (coef, tuple(modes) if isinstance(modes, (tuple, list)) else (modes,))
+    try:
+        hash(key)
+    except TypeError:
+        # an unhashable function
+        return None
+    return key
+
+
+def _simplify_executor(workers: int) -> Executor:
+    global _simplify_pool
+    with _simplify_lock:
+        if _simplify_pool is None or _simplify_pool[0] != workers:
+            if _simplify_pool is not None:
+                _simplify_pool[1].shutdown(wait=False)
+            _simplify_pool = (workers, ProcessPoolExecutor(workers))
+        return _simplify_pool[1]
+
+
+@atexit.register
+def _shutdown_simplify_pool() -> None:
+    global _simplify_pool
+    with _simplify_lock:
+        pool, _simplify_pool = _simplify_pool, None
+    if pool is not None:
+        pool[1].shutdown()
+
+
+def simplify_coefs(coefs, modes, workers: Optional[int] = None) -> List[Expr]:
+    """
+    Apply a function or list of functions, `modes`, to each of a list of
+    scalar coefficients, as :func:`apply_function_list` does.
+
+    The results for the most recently simplified coefficients are cached, so
+    simplifying a coefficient which recurs, such as in each component of a
+    multivector or each time a multivector is printed, is cheap.  Use
+    :meth:`Simp.clear_cache` to discard them.
+
+    Parameters
+    ----------
+    coefs :
+        The coefficients to simplify
+    modes :
+        A function or list of functions to apply to each coefficient
+    workers :
+        Simplify the coefficients which are not cached in a pool of this many
+        processes, which is worthwhile for large coefficients.  `modes` must
+        then be picklable.  Defaults to :attr:`Simp.workers`; ``None`` or
+        ``1`` simplify in this process.
+    """
+    if workers is None:
+        workers = Simp.workers
+    coefs = list(coefs)
+    results = [None] * len(coefs)
+
+    # the coefficients to simplify, with the indices of each
+    pending = OrderedDict()
+    with _simplify_lock:
+        for i, coef in enumerate(coefs):
+            key = _simplify_key(coef, modes)
+            if key is None:
+                pending.setdefault((coef, None), []).append(i)
+                continue
+            result = _simplify_cache.get(key)
+            if result is not None:
+                _simplify_cache.move_to_end(key)
+                results[i] = result
+            else:
+                pending.setdefault(key, []).append(i)
+
+    if workers is not None and workers > 1 and len(pending) > 1:
+        values = _simplify_executor(workers).map(
+            partial(apply_function_list, modes), [key[0] for key in pending])
+    else:
+        values = (apply_function_list(modes, key[0]) for key in pending)
+
+    for (key, indices), value in zip(pending.items(), values):
+        for i in indices:
+            results[i] = value
+        if key[1] is not None:
+            with _simplify_lock:
+                _simplify_cache[key] = value
+                if len(_simplify_cache) > _SIMPLIFY_CACHE_SIZE:
+                    _simplify_cache.popitem(last=False)
+    return results
+
+
+def simplify_coef(coef, modes):
+    """
+    Apply `modes` to a single coefficient, caching the result as
+    :func:`simplify_coefs` does.
+    """
+    return simplify_coefs([coef], modes)[0]
+
+
 class Simp:
     modes = [simplify]
 
+    #: The default number of processes to simplify coefficients in, see
+    #: :func:`simplify_coefs`.  ``None`` simplifies them in this process.
+    workers: Optional[int] = None
+
     @staticmethod
     def profile(s):
         Simp.modes = s
 
     @staticmethod
-    def apply(expr):
+    def apply(expr, workers: Optional[int] = None):
+        terms = list(linear_expand_terms(expr))
+        coefs = simplify_coefs([coef for coef, base in terms], Simp.modes, workers=workers)
         obj = S.Zero
-        for coef, base in linear_expand_terms(expr):
-            obj += apply_function_list(Simp.modes, coef) * base
+        for coef, (_, base) in zip(coefs, terms):
+            obj += coef * base
         return obj
 
+    @staticmethod
+    def clear_cache():
+        """ Discard the cached results of simplifying coefficients, see :func:`simplify_coefs` """
+        with _simplify_lock:
+            _simplify_cache.clear()
+
+    @staticmethod
+    def shutdown_workers():
+        """
+        Stop the worker processes that :func:`simplify_coefs` started, if
+        any.  They are started again when they are next needed, and are
+        stopped automatically when the interpreter exits.
+        """
+        _shutdown_simplify_pool()
+
     @staticmethod
     def applymv(mv):
         return Mv(Simp.apply(mv.obj), ga=mv.Ga)
@@ -494,7 +764,16 @@ class Metric(object):
 
     @_cached_property
     def de(self) -> Optional[List[List[Expr]]]:
-        # Derivatives of basis vectors from Christoffel symbols
+        r"""
+        Derivatives of basis vectors, ``de[i][j]`` is
+        :math:`\partial_{x_{i}}e_{j}`, or ``None`` if there is no connection
+        """
+        return self._de
+
+    @_cached_property
+    def _de(self) -> Optional[List[List[Expr]]]:
+        # Derivatives of basis vectors from Christoffel symbols, in terms of
+        # the reciprocal basis vectors
 
         n_range = self.n_range
 
@@ -599,7 +878,7 @@ class Metric(object):
     def normalize_metric(self):
 
         # normalize derivatives
-        if self.de is not None:
+        if self._de is not None:
             # Generate mapping for renormalizing reciprocal basis vectors
             renorm = [
                 (self.r_symbols[ib], self.r_symbols[ib] / self.e_norm[ib])
@@ -609,14 +888,14 @@ class Metric(object):
             # Normalize derivatives of basis vectors
             for x_i in self.n_range:
                 for jb in self.n_range:
-                    self.de[x_i][jb] = Simp.apply((((self.de[x_i][jb].subs(renorm)
-                                                  - diff(self.e_norm[jb], self.coords[x_i]) *
-                                                  self.basis[jb]) / self.e_norm[jb])))
+                    self._de[x_i][jb] = Simp.apply((((self._de[x_i][jb].subs(renorm)
+                                                   - diff(self.e_norm[jb], self.coords[x_i]) *
+                                                   self.basis[jb]) / self.e_norm[jb])))
             if self.debug:
                 printer.oprint('e^{i}->e^{i}/|e_{i}|', renorm)
                 for x_i in self.n_range:
                     for jb in self.n_range:
-                        print(r'\partial_{' + str(self.coords[x_i]) + r'}\hat{e}_{' + str(self.coords[jb]) + '} =', self.de[x_i][jb])
+                        print(r'\partial_{' + str(self.coords[x_i]) + r'}\hat{e}_{' + str(self.coords[jb]) + '} =', self._de[x_i][jb])
 
         # Normalize metric tensor
         for ib in self.n_range:
@@ -6,12 +6,12 @@ import copy
 import numbers
 import operator
 from functools import reduce
-from typing import List, Any, Tuple, Union, TYPE_CHECKING
+from typing import List, Any, Tuple, Union, Dict, Callable, Optional, TYPE_CHECKING
 
 from sympy import (
     Symbol, Function, S, expand, Add,
     sin, cos, sinh, cosh, sqrt, trigsimp,
-    simplify, diff, Expr, Abs, collect, SympifyError,
+    simplify, diff, Expr, Abs, collect, SympifyError, lambdify,
 )
 from sympy import exp as sympy_exp
 from sympy import N as Nsympy
@@ -26,6 +26,7 @@ from . import dop
 
 if TYPE_CHECKING:
     from galgebra.ga import Ga
+    from galgebra.lazy import LazyMv
 
 # This file does not and should not use these.
 # Unfortunately, some of our examples do.
@@ -43,6 +44,24 @@ _StrPrinter._default_settings.update({
 })
 
 
+def _is_scalar_coef(A) -> bool:
+    """ True if `A` can be used directly as a coefficient of a blade """
+    return isinstance(A, numbers.Number) or (isinstance(A, Expr) and A.is_commutative)
+
+
+def _combine_terms(terms1: Dict[int, Expr], terms2: Dict[int, Expr], op) -> Dict[int, Expr]:
+    """
+    Combine two canonical dictionaries of blade coefficients with a linear
+    operation `op`, such as ``operator.add``.
+    """
+    result = {}
+    for mask in list(terms1) + [mask for mask in terms2 if mask not in terms1]:
+        coef = op(terms1.get(mask, S.Zero), terms2.get(mask, S.Zero))
+        if coef != S.Zero:
+            result[mask] = coef
+    return result
+
+
 ########################### Multivector Class ##########################
 
 
@@ -70,7 +89,11 @@ class Mv(printer.GaPrintable):
     Attributes
     ----------
     obj : sympy.core.Expr
-        The underlying sympy expression for this multivector
+        The underlying sympy expression for this multivector.
+
+        Multivectors produced by products, sums, and grade operations store
+        their blade coefficients in a dictionary instead, and only build this
+        expression the first time it is accessed.
     """
 
     ################### Multivector initialization #####################
@@ -114,6 +137,68 @@ class Mv(printer.GaPrintable):
         else:
             raise ValueError('Operation ' + op + 'not allowed in Mv.Mul!')
 
+    @property
+    def obj(self) -> Expr:
+        obj = self._obj
+        if obj is None:
+            obj = self._obj = self.Ga._expr_of_terms(self._terms)
+        return obj
+
+    @obj.setter
+    def obj(self, value: Expr) -> None:
+        self._obj = value
+        self._terms = None
+        self._compiled = None
+        self._sandwich = None
+
+    @classmethod
+    def _from_terms(cls, terms: Dict[int, Expr], ga: 'Ga') -> 'Mv':
+        """
+        Construct a multivector from a canonical dictionary of blade
+        coefficients, as produced by :meth:`~galgebra.ga.Ga._terms_of`.
+        """
+        self = cls(ga=ga)
+        self._obj = None
+        self._terms = terms
+        grades = sorted({mask.bit_count() for mask in terms}) or [0]
+        self.grades = grades
+        self.i_grade = grades[0] if len(grades) == 1 else None
+        self.char_Mv = True
+        return self
+
+    def _blade_terms(self) -> Dict[int, Expr]:
+        """
+        The coefficients of the blade representation of this multivector,
+        keyed by blade bitmask.
+
+        This is computed from :attr:`obj` once and then cached, so must not be
+        modified.
+        """
+        terms = self._terms
+        if terms is None:
+            obj = self._obj
+            if not self.is_blade_rep:
+                obj = self.Ga.base_to_blade_rep(obj)
+            terms = self._terms = self.Ga._terms_of(obj)
+        return terms
+
+    def _map_terms(self, func: Callable[[int, Expr], Expr]) -> 'Mv':
+        """
+        Apply ``func(mask, coef)`` to each coefficient of the blade
+        representation, where ``func`` returns an expanded coefficient.
+        """
+        return Mv._from_terms({
+            mask: new_coef
+            for mask, coef in self._blade_terms().items()
+            for new_coef in [func(mask, coef)]
+            if new_coef != S.Zero
+        }, ga=self.Ga)
+
+    def _product(self, A: 'Mv', product) -> 'Mv':
+        """ Apply a :class:`~galgebra.ga.BladeProductFunction` to the blade representations """
+        return Mv._from_terms(
+            product.of_terms(self._blade_terms(), A._blade_terms()), ga=self.Ga)
+
     def characterise_Mv(self) -> None:
         if self.char_Mv:
             return
@@ -219,7 +304,7 @@ class Mv(printer.GaPrintable):
             return Mv._make_grade(ga, name, 0, **kwargs)
         else:
             value = __name_or_value
-            return value
+            return S(value)
 
     @staticmethod
     def _make_vector(ga: 'Ga', __name_or_coeffs: Union[str, list, tuple], **kwargs) -> Expr:
@@ -357,6 +442,8 @@ class Mv(printer.GaPrintable):
         self.versor_flg = None  # if is_versor is called flag is set
         self.coords = self.Ga.coords
         self.title = None
+        self._compiled = None  # cache for compile()
+        self._sandwich = None  # cache for sandwich()
 
         if len(args) == 0:  # default constructor 0
             self.obj = S.Zero
@@ -365,7 +452,8 @@ class Mv(printer.GaPrintable):
         elif len(args) == 1 and not isinstance(args[0], str):  # copy constructor
             x = args[0]
             if isinstance(x, Mv):
-                self.obj = x.obj
+                self._obj = x._obj
+                self._terms = x._terms
                 self.is_blade_rep = x.is_blade_rep
                 self.i_grade = x.i_grade
                 self.characterise_Mv()
@@ -417,18 +505,10 @@ class Mv(printer.GaPrintable):
             blade_qform = blade.qform()
             if blade_qform == ZERO:
                 raise ValueError(str(blade) + ' is a null blade; cannot reflect in a null blade')
-            self.characterise_Mv()
-            blade.characterise_Mv()
             blade_inv = blade.rev() / blade_qform  # ### GSG replaced .norm2() by .qform()
-            grade_dict = self.Ga.grade_decomposition(self)
-            blade_grade = blade.i_grade
-            reflect = Mv(0, 'scalar', ga=self.Ga)
-            for grade in list(grade_dict.keys()):
-                if (grade * (blade_grade + 1)) % 2 == 0:
-                    reflect += blade * grade_dict[grade] * blade_inv
-                else:
-                    reflect -= blade * grade_dict[grade] * blade_inv
-            return reflect
+            # The grade r part is reflected with sign (-1)**(r*(blade_grade+1)),
+            # which is the sandwich of the grade involute.
+            return blade.sandwich(self.g_invol(), inverse=blade_inv)
         else:
             raise ValueError(str(blade) + 'is not a blade in reflect_in_blade(self, blade)')
 
@@ -447,7 +527,78 @@ class Mv(printer.GaPrintable):
     def rotate_multivector(self, itheta: 'Mv', hint: str = '-'):
         Rm = (-itheta/S(2)).exp(hint)
         Rp = (itheta/S(2)).exp(hint)
-        return Rm * self * Rp
+        return Rm.sandwich(self, inverse=Rp)
+
+    def sandwich(self, X: 'Mv', inverse: 'Mv' = None) -> 'Mv':
+        r"""
+        Apply the versor `self` to `X` by the sandwich product.
+
+        For a versor :math:`V` this is :math:`V X V^{-1}` if :math:`V` is even
+        and :math:`V \hat{X} V^{-1}` if it is odd, where :math:`\hat{X}` is the
+        grade involute of :math:`X`.  In both cases vectors are mapped to
+        vectors and the map is an outermorphism.
+
+        The image of each basis blade is computed the first time it is needed
+        and cached on `self`, so applying the same versor to many multivectors
+        only costs a linear combination of these images per application.
+
+        Parameters
+        ----------
+        X :
+            The multivector to transform
+        inverse :
+            The inverse of `self`, if already known in a preferable form.
+            Defaults to :meth:`inv`.
+        """
+        if not isinstance(X, Mv):
+            X = Mv(X, ga=self.Ga)
+        elif X.Ga != self.Ga:
+            raise ValueError('In sandwich Mv arguments are not from same geometric algebra')
+        columns = self._sandwich_columns(inverse)
+        acc = metric._TermAccumulator()
+        for mask, coef in X._blade_terms().items():
+            for image_mask, image_coef in columns[mask].items():
+                acc.add(image_mask, coef * image_coef)
+        return Mv._from_terms(metric._canonical_terms(acc.coefs()), ga=self.Ga)
+
+    def _sandwich_columns(self, inverse: 'Mv' = None, cache: bool = True) -> Dict[int, Dict[int, Expr]]:
+        """
+        The images of the basis blades under :meth:`sandwich`, as a lazy
+        dictionary from blade bitmasks to blade coefficient dictionaries.
+        These are the columns of the matrix of the sandwich product.
+
+        If `cache` is false the columns are not stored on `self`, so that
+        :meth:`sandwich` does not reuse them with an `inverse` which turns
+        out not to be the inverse of `self`.
+        """
+        cached = self._sandwich
+        if cached is not None and (inverse is None or cached[0] is inverse):
+            return cached[1]
+
+        terms = self._blade_terms()
+        parities = {mask.bit_count() % 2 for mask in terms}
+        if len(parities) > 1:
+            raise ValueError(
+                '{} is not of definite parity, so is not a versor'.format(self))
+        odd = parities == {1}
+        if inverse is None:
+            inverse = self.inv()
+        elif inverse.Ga != self.Ga:
+            raise ValueError('In sandwich Mv arguments are not from same geometric algebra')
+        inverse_terms = inverse._blade_terms()
+        mul = self.Ga.mul
+
+        def column(mask: int) -> Dict[int, Expr]:
+            image = mul.of_terms(mul.of_terms(terms, {mask: S.One}), inverse_terms)
+            if odd and mask.bit_count() % 2:
+                image = {image_mask: -coef for image_mask, coef in image.items()}
+            return image
+
+        from .ga import lazy_dict
+        columns = lazy_dict({}, f_value=column)
+        if cache:
+            self._sandwich = (inverse, columns)
+        return columns
 
     def base_rep(self) -> 'Mv':
         """ Express as a linear combination of geometric products """
@@ -511,6 +662,8 @@ class Mv(printer.GaPrintable):
     """
 
     def __neg__(self):
+        if self._terms is not None:
+            return self._map_terms(lambda mask, coef: -coef)
         return Mv(-self.obj, ga=self.Ga)
 
     def _arithmetic_op(self, A, op, name: str):
@@ -519,6 +672,10 @@ class Mv(printer.GaPrintable):
             return NotImplemented
 
         if not isinstance(A, Mv):
+            if self._terms is not None and _is_scalar_coef(A):
+                A = expand(A)
+                return Mv._from_terms(
+                    _combine_terms(self._terms, {0: A} if A != S.Zero else {}, op), ga=self.Ga)
             return Mv(op(self.obj, A), ga=self.Ga)
 
         if self.Ga != A.Ga:
@@ -526,6 +683,11 @@ class Mv(printer.GaPrintable):
                 'In {} operation Mv arguments are not from same geometric '
                 'algebra'.format(name))
 
+        if self._terms is not None or A._terms is not None:
+            # at least one is already split into blade coefficients
+            return Mv._from_terms(
+                _combine_terms(self._blade_terms(), A._blade_terms(), op), ga=self.Ga)
+
         if self.is_blade_rep == A.is_blade_rep:
             return Mv(op(self.obj, A.obj), ga=self.Ga)
         else:
@@ -552,41 +714,37 @@ class Mv(printer.GaPrintable):
             return NotImplemented
 
         if not isinstance(A, Mv):
-            return Mv(expand(A * self.obj), ga=self.Ga)
+            return self._scale(A)
 
         if self.Ga != A.Ga:
             raise ValueError('In * operation Mv arguments are not from same geometric algebra')
 
-        if self.is_scalar():
-            return Mv(self.obj * A, ga=self.Ga)
-
         if self.is_blade_rep and A.is_blade_rep:
-            self = self.base_rep()
-            A = A.base_rep()
+            return self._product(A, self.Ga.mul)
 
-            selfxA = Mv(self.Ga.mul(self.obj, A.obj), ga=self.Ga)
-            selfxA.is_blade_rep = False
-            return selfxA.blade_rep()
+        if self.is_scalar():
+            return Mv(self.obj * A, ga=self.Ga)
 
-        elif self.is_blade_rep:
+        if self.is_blade_rep:
             self = self.base_rep()
-
-            selfxA = Mv(self.Ga.mul(self.obj, A.obj), ga=self.Ga)
-            selfxA.is_blade_rep = False
-            return selfxA.blade_rep()
-
         elif A.is_blade_rep:
             A = A.base_rep()
-
-            selfxA = Mv(self.Ga.mul(self.obj, A.obj), ga=self.Ga)
-            selfxA.is_blade_rep = False
-            return selfxA.blade_rep()
         else:
             return Mv(self.Ga.mul(self.obj, A.obj), ga=self.Ga)
 
+        selfxA = Mv(self.Ga.mul(self.obj, A.obj), ga=self.Ga)
+        selfxA.is_blade_rep = False
+        return selfxA.blade_rep()
+
     def __rmul__(self, A):
         if isinstance(A, dop._BaseDop):
             return NotImplemented
+        return self._scale(A)
+
+    def _scale(self, A) -> 'Mv':
+        """ Multiply by a non-multivector `A` """
+        if self._terms is not None and _is_scalar_coef(A):
+            return self._map_terms(lambda mask, coef: expand(A * coef))
         return Mv(expand(A * self.obj), ga=self.Ga)
 
     def __truediv__(self, A):
@@ -795,9 +953,7 @@ class Mv(printer.GaPrintable):
         if self.is_scalar():
             return self * A
 
-        self = self.blade_rep()
-        A = A.blade_rep()
-        return Mv(self.Ga.wedge(self.obj, A.obj), ga=self.Ga)
+        return self._product(A, self.Ga.wedge)
 
     def __rxor__(self, A):  # wedge (^) product
         if isinstance(A, dop._BaseDop):
@@ -815,9 +971,7 @@ class Mv(printer.GaPrintable):
         if self.Ga != A.Ga:
             raise ValueError('In | operation Mv arguments are not from same geometric algebra')
 
-        self = self.blade_rep()
-        A = A.blade_rep()
-        return Mv(self.Ga.hestenes_dot(self.obj, A.obj), ga=self.Ga)
+        return self._product(A, self.Ga.hestenes_dot)
 
     def __ror__(self, A):  # dot (|) product
         if isinstance(A, dop._BaseDop):
@@ -865,9 +1019,7 @@ class Mv(printer.GaPrintable):
         if self.Ga != A.Ga:
             raise ValueError('In < operation Mv arguments are not from same geometric algebra')
 
-        self = self.blade_rep()
-        A = A.blade_rep()
-        return Mv(self.Ga.left_contract(self.obj, A.obj), ga=self.Ga)
+        return self._product(A, self.Ga.left_contract)
 
     def __gt__(self, A):  # right contraction (>)
         if isinstance(A, Dop):
@@ -885,9 +1037,7 @@ class Mv(printer.GaPrintable):
         if self.Ga != A.Ga:
             raise ValueError('In > operation Mv arguments are not from same geometric algebra')
 
-        self = self.blade_rep()
-        A = A.blade_rep()
-        return Mv(self.Ga.right_contract(self.obj, A.obj), ga=self.Ga)
+        return self._product(A, self.Ga.right_contract)
 
     def collect(self, deep=False) -> 'Mv':
         """
@@ -903,27 +1053,23 @@ class Mv(printer.GaPrintable):
         self.obj = self.obj.collect(c)
         return self
         """
-        obj_dict = {}
+        acc = metric._TermAccumulator()
         for coef, base in metric.linear_expand_terms(self.obj):
-            if base in list(obj_dict.keys()):
-                obj_dict[base] += coef
-            else:
-                obj_dict[base] = coef
-        obj = S.Zero
-        for base in list(obj_dict.keys()):
-            if deep:
-                obj += collect(obj_dict[base])*base
-            else:
-                obj += obj_dict[base]*base
+            acc.add(base, coef)
+        obj = Add(*[
+            (collect(coef) if deep else coef) * base
+            for base, coef in acc.coefs().items()
+        ])
         return Mv(obj, ga=self.Ga)
 
     def is_scalar(self) -> bool:
-        grades = self.Ga.grades(self.obj)
-        return grades == [0]
+        return all(mask == 0 for mask in self._blade_terms())
 
     def is_vector(self) -> bool:
-        grades = self.Ga.grades(self.obj)
-        return grades == [1]
+        terms = self._blade_terms()
+        if not terms:
+            return False
+        return all(mask.bit_count() == 1 for mask in terms)
 
     def is_blade(self) -> bool:
         """
@@ -1005,10 +1151,21 @@ class Mv(printer.GaPrintable):
             return self.versor_flg
 
         # Test condition 2: V.g_invol()*x*V.rev() must be a vector
-        # where x is a generic vector
-        # and self.Ga._XOX is a generic vector in self's geometric algebra
-        VinvolXVrev = self.g_invol() * self.Ga._XOX * self_rev
-        self.versor_flg = VinvolXVrev.is_vector()
+        # where x is a generic vector.  By linearity it suffices to check the
+        # images of the basis vectors, which are cached for sandwich() once
+        # self is known to be a versor, as only then is the inverse used here
+        # the inverse of self.
+        if len({mask.bit_count() % 2 for mask in self._blade_terms()}) > 1:
+            self.versor_flg = False
+            return self.versor_flg
+        inverse = self_rev / VVrev.scalar()
+        columns = self._sandwich_columns(inverse=inverse, cache=False)
+        self.versor_flg = all(
+            all(mask.bit_count() == 1 for mask in columns[1 << i])
+            for i in range(self.Ga.n)
+        )
+        if self.versor_flg:
+            self._sandwich = (inverse, columns)
         return self.versor_flg
 
     r'''
@@ -1026,15 +1183,23 @@ class Mv(printer.GaPrintable):
     '''
 
     def is_zero(self) -> bool:
+        if self._terms is not None:
+            return not self._terms
         return self.obj == 0
 
     def scalar(self) -> Expr:
         """ return scalar part of multivector as sympy expression """
+        if self._terms is not None:
+            return self._terms.get(0, S.Zero)
         return self.Ga.scalar_part(self.obj)
 
     def get_grade(self, r: int) -> 'Mv':
         """ return r-th grade of multivector as a multivector """
-        return Mv(self.Ga.get_grade(self.obj, r), ga=self.Ga)
+        return Mv._from_terms({
+            mask: coef
+            for mask, coef in self._blade_terms().items()
+            if mask.bit_count() == r
+        }, ga=self.Ga)
 
     def components(self) -> List['Mv']:
         cb = metric.linear_expand_terms(self.obj)
@@ -1126,11 +1291,19 @@ class Mv(printer.GaPrintable):
 
     def even(self) -> 'Mv':
         """ return even parts of multivector """
-        return Mv(self.Ga.even_odd(self.obj, True), ga=self.Ga)
+        return Mv._from_terms({
+            mask: coef
+            for mask, coef in self._blade_terms().items()
+            if mask.bit_count() % 2 == 0
+        }, ga=self.Ga)
 
     def odd(self) -> 'Mv':
         """ return odd parts of multivector """
-        return Mv(self.Ga.even_odd(self.obj, False), ga=self.Ga)
+        return Mv._from_terms({
+            mask: coef
+            for mask, coef in self._blade_terms().items()
+            if mask.bit_count() % 2 == 1
+        }, ga=self.Ga)
 
     # ## GSG code starts ###
     def g_invol(self) -> 'Mv':
@@ -1139,12 +1312,14 @@ class Mv(printer.GaPrintable):
           `self`'s odd grade part but preserves its even grade part.
         - Grade involution is its own inverse operation.
         """
-        return self.even() - self.odd()
+        return self._map_terms(
+            lambda mask, coef: -coef if mask.bit_count() % 2 else coef)
     # ## GSG code ends ###
 
     def rev(self) -> 'Mv':
-        self = self.blade_rep()
-        return Mv(self.Ga.reverse(self.obj), ga=self.Ga)
+        # the reverse of a grade r blade picks up a sign of (-1)**(r*(r-1)/2)
+        return self._map_terms(
+            lambda mask, coef: -coef if mask.bit_count() % 4 in (2, 3) else coef)
 
     __invert__ = rev  # allow `~x` to call x.rev()
 
@@ -1493,21 +1668,23 @@ class Mv(printer.GaPrintable):
         return fct_self
 
     def trigsimp(self) -> 'Mv':
-        return self.func(trigsimp)
+        return self.func(lambda coef: metric.simplify_coef(coef, trigsimp))
 
-    def simplify(self, modes=simplify) -> 'Mv':
+    def simplify(self, modes=simplify, workers: Optional[int] = None) -> 'Mv':
         """
         Simplify a multivector by scalar (sympy) simplifications.
         `modes` is an operation or sequence of operations to apply to the the
-        coefficients of a multivector expansion.
+        coefficients of a multivector expansion.  The results are cached, and
+        the coefficients can be simplified in a pool of `workers` processes,
+        see :func:`~galgebra.metric.simplify_coefs`.
         """
         if not isinstance(modes, (list, tuple)):
             modes = [modes]
 
+        terms = list(metric.linear_expand_terms(self.obj))
+        coefs = metric.simplify_coefs([coef for coef, base in terms], modes, workers=workers)
         obj = S.Zero
-        for coef, base in metric.linear_expand_terms(self.obj):
-            for mode in modes:
-                coef = mode(coef)
+        for coef, (_, base) in zip(coefs, terms):
             obj += coef * base
         return Mv(obj, ga=self.Ga)
 
@@ -1527,6 +1704,57 @@ class Mv(printer.GaPrintable):
     def list(self) -> List[Expr]:
         return self.blade_coefs(self.Ga.mv_blades[1])
 
+    def compile(self, args, modules=None) -> Callable:
+        """
+        Compile the coefficients into a single numeric function of `args`.
+
+        The returned function takes values for the symbols in `args`, and
+        returns a list of the coefficients of every blade in
+        :attr:`Ga.blades` ``.flat`` order.  It is built with
+        :func:`sympy.utilities.lambdify.lambdify` using ``cse=True``, so
+        subexpressions shared between coefficients are only evaluated once.
+
+        The function is cached on the multivector for each `args`, and
+        `modules` if it is hashable.
+
+        Parameters
+        ----------
+        args :
+            A symbol or sequence of symbols, as accepted by ``lambdify``
+        modules :
+            The numeric modules to use, as accepted by ``lambdify``
+        """
+        key = (tuple(args) if isinstance(args, (list, tuple)) else args, modules)
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        if self._compiled is None:
+            self._compiled = {}
+        elif key is not None and key in self._compiled:
+            return self._compiled[key]
+
+        terms = self._blade_terms()
+        coefs = [
+            terms.get(self.Ga._blade_bitmasks[blade], S.Zero)
+            for blade in self.Ga.blades.flat
+        ]
+        f = lambdify(args, coefs, modules=modules, cse=True)
+        if key is not None:
+            self._compiled[key] = f
+        return f
+
+    def lazy(self) -> 'LazyMv':
+        """
+        Start a graph of deferred operations on this multivector.
+
+        Operations on the result are recorded rather than computed, and grade
+        projections of products only compute the grades that are kept.  See
+        :mod:`galgebra.lazy`.
+        """
+        from .lazy import _Leaf
+        return _Leaf(self)
+
     def grade(self, r=0) -> 'Mv':
         return self.get_grade(r)
 
@@ -0,0 +1,292 @@
+"""
+Arrays of multivectors, stored as a single array of blade coefficients.
+
+Requires NumPy, which is imported the first time an :class:`MvArray` is
+created.
+"""
+from typing import List, Sequence, TYPE_CHECKING
+
+from sympy import S, expand, sympify, Expr
+
+from .mv import Mv, _is_scalar_coef
+
+if TYPE_CHECKING:
+    from galgebra.ga import Ga, BladeProductFunction
+
+
+def _numpy():
+    import numpy
+    return numpy
+
+
+class MvArray:
+    """
+    A batch of multivectors from a single algebra, with vectorized operations.
+
+    The coefficients are held in one array whose last axis holds the
+    coefficients of the blades in :attr:`Ga.blades` ``.flat`` order.  The
+    array may have a numeric dtype, or ``dtype=object`` to hold sympy
+    expressions.  The products ``*``, ``^``, ``|``, ``<`` and ``>`` are
+    evaluated elementwise with the kernels from
+    :meth:`~galgebra.ga.BladeProductFunction.numpy_kernel`, broadcasting
+    over the leading axes.
+
+    The other operand of a product may be another :class:`MvArray`, a single
+    :class:`~galgebra.mv.Mv` which is applied to every element, or for ``*``,
+    ``+`` and ``-`` a scalar.  A single :class:`~galgebra.mv.Mv` on the left
+    can be written as ``MvArray.from_mvs([mv]) * arr``.
+
+    Parameters
+    ----------
+    ga : Ga
+        The algebra of the multivectors
+    coefs : array_like
+        The coefficients, of shape ``(..., 2**n)``
+
+    Attributes
+    ----------
+    coefs : numpy.ndarray
+        The coefficients of the multivectors
+    """
+
+    def __init__(self, ga: 'Ga', coefs) -> None:
+        coefs = _numpy().asarray(coefs)
+        n_blades = len(ga.blades.flat)
+        if coefs.ndim == 0 or coefs.shape[-1] != n_blades:
+            raise ValueError(
+                "Expected an array with {} blade coefficients along the last axis, "
+                "got shape {}".format(n_blades, coefs.shape))
+        self.Ga = ga
+        self.coefs = coefs
+
+    @classmethod
+    def from_mvs(cls, mvs: Sequence[Mv], dtype=None) -> 'MvArray':
+        """
+        Build an array from a sequence of multivectors.
+
+        If `dtype` is not given, a float array is used if all the
+        coefficients are numbers, and an object array otherwise.
+        """
+        np = _numpy()
+        mvs = list(mvs)
+        if not mvs:
+            raise ValueError("Cannot determine the algebra of an empty sequence of multivectors")
+        ga = mvs[0].Ga
+        positions = _mask_positions(ga)
+        rows = []
+        for A in mvs:
+            if A.Ga != ga:
+                raise ValueError('Multivectors are not from the same geometric algebra')
+            row = [S.Zero] * len(positions)
+            for mask, coef in A._blade_terms().items():
+                row[positions[mask]] = coef
+            rows.append(row)
+        if dtype is None:
+            numeric = all(c.is_number for row in rows for c in row)
+            dtype = float if numeric else object
+        return cls(ga, np.array(rows, dtype=object).astype(dtype))
+
+    def to_mvs(self) -> List[Mv]:
+        """ Convert to a flat list of multivectors, in C order """
+        ga = self.Ga
+        masks = _position_masks(ga)
+        result = []
+        for row in self.coefs.reshape(-1, len(masks)):
+            terms = {}
+            for mask, coef in zip(masks, row):
+                coef = expand(sympify(coef))
+                if coef != S.Zero:
+                    terms[mask] = coef
+            result.append(Mv._from_terms(terms, ga=ga))
+        return result
+
+    @property
+    def shape(self):
+        """ The shape of the array of multivectors, excluding the blade axis """
+        return self.coefs.shape[:-1]
+
+    def __len__(self) -> int:
+        return len(self.coefs)
+
+    def __getitem__(self, key) -> 'MvArray':
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > len(self.shape):
+            raise IndexError('too many indices for an MvArray of shape {}'.format(self.shape))
+        # never index the blade axis
+        return MvArray(self.Ga, self.coefs[key + (Ellipsis,)])
+
+    def __repr__(self) -> str:
+        return '{}({}, shape={})'.format(type(self).__qualname__, self.Ga, self.shape)
+
+    def _coefs_of(self, A):
+        """ The coefficients of an operand, which must be from the same algebra """
+        if isinstance(A, MvArray):
+            coefs = A.coefs
+            ga = A.Ga
+        elif isinstance(A, Mv):
+            ga = A.Ga
+            coefs = MvArray.from_mvs([A]).coefs[0]
+        else:
+            raise TypeError('Expected an MvArray or Mv, got {!r}'.format(type(A).__name__))
+        if ga != self.Ga:
+            raise ValueError('Multivectors are not from the same geometric algebra')
+        return coefs
+
+    def _addend_coefs(self, A):
+        """
+        The coefficients of an operand of ``+`` or ``-``, where a scalar is
+        added to the scalar part of every multivector as for
+        :class:`~galgebra.mv.Mv`, or ``None`` if `A` is not supported.
+        """
+        if isinstance(A, (MvArray, Mv)):
+            return self._coefs_of(A)
+        if not _is_scalar_coef(A):
+            return None
+        A = sympify(A)
+        positions = _mask_positions(self.Ga)
+        row = [S.Zero] * len(positions)
+        row[positions[0]] = A
+        dtype = float if A.is_number and A.is_real else object
+        return _numpy().array(row, dtype=object).astype(dtype)
+
+    def _product(self, A, product: 'BladeProductFunction', reverse: bool = False) -> 'MvArray':
+        A_coefs = self._coefs_of(A)
+        exact = self.coefs.dtype == object or A_coefs.dtype == object
+        kernel = product.numpy_kernel(exact=exact)
+        if reverse:
+            return MvArray(self.Ga, kernel(A_coefs, self.coefs))
+        return MvArray(self.Ga, kernel(self.coefs, A_coefs))
+
+    def __mul__(self, A):
+        if isinstance(A, (MvArray, Mv)):
+            return self._product(A, self.Ga.mul)
+        if isinstance(A, Expr) and not A.is_commutative:
+            return NotImplemented
+        return MvArray(self.Ga, self.coefs * A)
+
+    def __rmul__(self, A):
+        if isinstance(A, Expr) and not A.is_commutative:
+            return NotImplemented
+        return MvArray(self.Ga, A * self.coefs)
+
+    def __truediv__(self, A):
+        return MvArray(self.Ga, self.coefs / A)
+
+    def __xor__(self, A):
+        return self._product(A, self.Ga.wedge)
+
+    def __or__(self, A):
+        return self._product(A, self.Ga.hestenes_dot)
+
+    def __lt__(self, A):
+        return self._product(A, self.Ga.left_contract)
+
+    def __gt__(self, A):
+        return self._product(A, self.Ga.right_contract)
+
+    def __add__(self, A):
+        A_coefs = self._addend_coefs(A)
+        if A_coefs is None:
+            return NotImplemented
+        return MvArray(self.Ga, self.coefs + A_coefs)
+
+    __radd__ = __add__
+
+    def __sub__(self, A):
+        A_coefs = self._addend_coefs(A)
+        if A_coefs is None:
+            return NotImplemented
+        return MvArray(self.Ga, self.coefs - A_coefs)
+
+    def __rsub__(self, A):
+        A_coefs = self._addend_coefs(A)
+        if A_coefs is None:
+            return NotImplemented
+        return MvArray(self.Ga, A_coefs - self.coefs)
+
+    def __neg__(self):
+        return MvArray(self.Ga, -self.coefs)
+
+    def _grade_signs(self, sign_of_grade):
+        grades = [mask.bit_count() for mask in _position_masks(self.Ga)]
+        return _numpy().array([sign_of_grade(grade) for grade in grades])
+
+    def rev(self) -> 'MvArray':
+        """ The reverse of each multivector """
+        return MvArray(self.Ga, self.coefs * self._grade_signs(
+            lambda r: -1 if r % 4 in (2, 3) else 1))
+
+    __invert__ = rev
+
+    def g_invol(self) -> 'MvArray':
+        """ The grade involute of each multivector """
+        return MvArray(self.Ga, self.coefs * self._grade_signs(
+            lambda r: -1 if r % 2 else 1))
+
+    def ccon(self) -> 'MvArray':
+        """ The Clifford conjugate of each multivector """
+        return self.g_invol().rev()
+
+    def dual(self) -> 'MvArray':
+        """ The dual of each multivector, following :meth:`Ga.dual_mode` like :meth:`Mv.dual` """
+        mode = self.Ga.dual_mode_value
+        I = self.Ga.i_inv if 'Iinv' in mode else self.Ga.i
+        if '-' in mode:
+            I = -I
+        if mode[0] in '+-':
+            return self._product(I, self.Ga.mul, reverse=True)
+        else:
+            return self._product(I, self.Ga.mul)
+
+    def sandwich(self, V: Mv) -> 'MvArray':
+        """
+        Apply the versor `V` to each multivector, as :meth:`Mv.sandwich`.
+
+        The action of `V` is assembled once into a matrix over the blades,
+        which is then applied to all the multivectors in a single matrix
+        product.
+        """
+        np = _numpy()
+        if V.Ga != self.Ga:
+            raise ValueError('Multivectors are not from the same geometric algebra')
+        masks = _position_masks(self.Ga)
+        positions = _mask_positions(self.Ga)
+        columns = V._sandwich_columns()
+        matrix = np.zeros((len(masks), len(masks)), dtype=object)
+        for j, mask in enumerate(masks):
+            for image_mask, coef in columns[mask].items():
+                matrix[positions[image_mask], j] = coef
+        if self.coefs.dtype != object and all(S(c).is_number for c in matrix.flat):
+            matrix = matrix.astype(float)
+        return MvArray(self.Ga, self.coefs @ matrix.T)
+
+    def grade(self, r: int) -> 'MvArray':
+        """ The grade `r` part of each multivector """
+        return MvArray(self.Ga, self.coefs * self._grade_signs(
+            lambda grade: 1 if grade == r else 0))
+
+    get_grade = grade
+
+    def even(self) -> 'MvArray':
+        """ The even part of each multivector """
+        return MvArray(self.Ga, self.coefs * self._grade_signs(
+            lambda grade: 1 - grade % 2))
+
+    def odd(self) -> 'MvArray':
+        """ The odd part of each multivector """
+        return MvArray(self.Ga, self.coefs * self._grade_signs(
+            lambda grade: grade % 2))
+
+    def scalar(self):
+        """ The scalar part of each multivector """
+        return self.coefs[..., 0]
+
+
+def _position_masks(ga: 'Ga') -> List[int]:
+    """ The bitmask of each blade in :attr:`Ga.blades` ``.flat`` """
+    return [ga._blade_bitmasks[blade] for blade in ga.blades.flat]
+
+
+def _mask_positions(ga: 'Ga'):
+    return {mask: i for i, mask in enumerate(_position_masks(ga))}
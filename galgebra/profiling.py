@@ -0,0 +1,246 @@
+"""
+Attribution of the time spent in galgebra to the phases of a computation.
+
+General purpose profilers such as :mod:`cProfile` report the few galgebra
+functions involved in a computation among thousands of sympy frames.
+:class:`profile` instead records the wall time and the number of calls of a
+few coarse phases:
+
+=================  ============================================================
+phase              what is timed
+=================  ============================================================
+``tables``         filling the tables of products of basis blades and bases
+``linear_expand``  splitting expressions into coefficients and basis blades
+``expand``         calls to :func:`sympy.expand` made by galgebra
+``simplify``       :meth:`~galgebra.metric.Simp.apply`,
+                   :meth:`~galgebra.mv.Mv.simplify` and
+                   :meth:`~galgebra.mv.Mv.trigsimp`, and calls to
+                   :func:`sympy.simplify` and :func:`sympy.trigsimp` made by
+                   galgebra
+``conversion``     conversion between the base and blade representations
+``derivatives``    :meth:`~galgebra.ga.Ga.pDiff` and
+                   :meth:`~galgebra.ga.Ga.blade_derivation`
+``dop``            application of differential operators
+``printing``       printing with the galgebra string and LaTeX printers
+=================  ============================================================
+
+The time spent in a phase while it is already running, such as a product
+table entry which needs another one, is only counted once.  The time spent
+in one phase while another is running is counted in both.
+
+While a profile is active, the functions of each phase are replaced by
+wrappers which time them, so there is no cost when no profile is active.
+The wrappers are installed once for all threads, while any thread has an
+active profile, but a profile only records the time spent in the thread
+which entered it.
+
+Example::
+
+    from galgebra.profiling import profile
+
+    with profile() as p:
+        ...
+    print(p)
+"""
+import contextlib
+import functools
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple, Union
+
+__all__ = ['PHASES', 'profile']
+
+PHASES = (
+    'tables', 'linear_expand', 'expand', 'simplify',
+    'conversion', 'derivatives', 'dop', 'printing',
+)
+
+# the number of profiles which are recording in any thread, and the replaced
+# attributes while there are any
+_lock = threading.Lock()
+_n_active = 0
+_patched: List[Tuple[object, str, bool, object]] = []
+
+# the profiles recording in each thread, and the phases running in it
+_local = threading.local()
+
+
+def _thread_profiles() -> List['profile']:
+    return _local.__dict__.setdefault('profiles', [])
+
+
+def _subclasses(cls) -> List[type]:
+    result = []
+    for sub in cls.__subclasses__():
+        result.append(sub)
+        result += _subclasses(sub)
+    return result
+
+
+def _targets() -> List[Tuple[str, object, str]]:
+    """ The ``(phase, owner, name)`` of each attribute to replace """
+    import sympy
+    from . import ga, metric, mv, dop, printer
+
+    targets = [
+        ('tables', ga._BaseGeometricProductFunction, 'of_basis_bases'),
+        ('conversion', ga.Ga, 'blade_to_base_rep'),
+        ('conversion', ga.Ga, 'base_to_blade_rep'),
+        ('derivatives', ga.Ga, 'pDiff'),
+        ('derivatives', ga.Ga, 'blade_derivation'),
+        ('dop', mv.Dop, '__mul__'),
+        ('dop', mv.Dop, '__rmul__'),
+        ('dop', dop.Sdop, '__call__'),
+        ('dop', dop.Pdop, '__call__'),
+        ('printing', printer.GaPrinter, 'doprint'),
+        ('printing', printer.GaLatexPrinter, 'doprint'),
+        ('simplify', metric.Simp, 'apply'),
+        ('simplify', mv.Mv, 'simplify'),
+        ('simplify', mv.Mv, 'trigsimp'),
+    ]
+    targets += [
+        ('tables', cls, 'of_basis_blades')
+        for cls in _subclasses(ga.BladeProductFunction)
+        if 'of_basis_blades' in vars(cls)
+    ]
+
+    # functions are replaced in every module which has imported them
+    functions = [
+        ('linear_expand', metric.linear_expand),
+        ('linear_expand', metric.linear_expand_terms),
+        ('expand', sympy.expand),
+        ('simplify', sympy.simplify),
+        ('simplify', sympy.trigsimp),
+    ]
+    modules = [
+        module for module_name, module in list(sys.modules.items())
+        if module_name.startswith('galgebra.') and module_name != __name__
+    ]
+    for module in modules:
+        for name, value in list(vars(module).items()):
+            for phase, f in functions:
+                if value is f:
+                    targets.append((phase, module, name))
+    return targets
+
+
+def _timed(phase: str, f):
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        profiles = _thread_profiles()
+        if not profiles:
+            # only another thread is profiling
+            return f(*args, **kwargs)
+        for p in profiles:
+            p.calls[phase] += 1
+        running = _local.__dict__.setdefault('running', set())
+        if phase in running:
+            return f(*args, **kwargs)
+        running.add(phase)
+        start = time.perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            running.discard(phase)
+            for p in profiles:
+                p.times[phase] += elapsed
+    return wrapper
+
+
+def _patch() -> None:
+    for phase, owner, name in _targets():
+        own = name in vars(owner)
+        original = vars(owner)[name] if own else getattr(owner, name)
+        if isinstance(original, staticmethod):
+            replacement = staticmethod(_timed(phase, original.__func__))
+        else:
+            replacement = _timed(phase, original)
+        setattr(owner, name, replacement)
+        _patched.append((owner, name, own, original))
+
+
+def _unpatch() -> None:
+    while _patched:
+        owner, name, own, original = _patched.pop()
+        if own:
+            setattr(owner, name, original)
+        else:
+            delattr(owner, name)
+
+
+class profile(contextlib.ContextDecorator):
+    """
+    Record the time spent in each of the :data:`PHASES` of galgebra.
+
+    Use as a context manager, ``with profile() as p:``, or as a decorator.
+    Each use of the same instance adds to its records.  Profiles can be
+    nested, in which case each records the time spent within it, and can be
+    used in several threads at once, in which case each records the time
+    spent in its own thread.  A single instance should only be used by one
+    thread at a time.
+
+    Attributes
+    ----------
+    calls : Dict[str, int]
+        The number of calls in each phase
+    times : Dict[str, float]
+        The wall time in seconds spent in each phase
+    total_time : float
+        The wall time in seconds spent within the profile
+    """
+
+    def __init__(self) -> None:
+        self._starts: List[float] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """ Discard the records """
+        self.calls: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.times: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.total_time = 0.0
+
+    def __enter__(self) -> 'profile':
+        global _n_active
+        if not self._starts:
+            with _lock:
+                if _n_active == 0:
+                    _patch()
+                _n_active += 1
+            _thread_profiles().append(self)
+        self._starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        global _n_active
+        self.total_time += time.perf_counter() - self._starts.pop()
+        if not self._starts:
+            _thread_profiles().remove(self)
+            with _lock:
+                _n_active -= 1
+                if _n_active == 0:
+                    _unpatch()
+        return False
+
+    def report(self) -> Dict[str, Union[float, Dict[str, Dict[str, Union[int, float]]]]]:
+        """
+        The records as a plain dictionary, of the form
+        ``{'total_time': t, 'phases': {phase: {'calls': n, 'time': t}}}``
+        """
+        return {
+            'total_time': self.total_time,
+            'phases': {
+                phase: {'calls': self.calls[phase], 'time': self.times[phase]}
+                for phase in PHASES
+            },
+        }
+
+    def __str__(self) -> str:
+        lines = ['{:<15}{:>10}{:>12}{:>8}'.format('phase', 'calls', 'time (s)', '%')]
+        for phase in sorted(PHASES, key=lambda phase: -self.times[phase]):
+            percent = 100 * self.times[phase] / self.total_time if self.total_time else 0.0
+            lines.append('{:<15}{:>10}{:>12.4f}{:>8.1f}'.format(
+                phase, self.calls[phase], self.times[phase], percent))
+        lines.append('{:<15}{:>10}{:>12.4f}'.format('total', '', self.total_time))
+        return '\n'.join(lines)
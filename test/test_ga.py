@@ -0,0 +1,457 @@
+import itertools
+
+import pytest
+from sympy import symbols, S
+
+from galgebra.ga import Ga, lazy_dict, nc_subs, _GeometricProductFunction
+
+
+def _ortho_ga(n=3, **kwargs):
+    g = symbols('g_1:{}'.format(n + 1), real=True)
+    return Ga('e*' + '|'.join(str(i + 1) for i in range(n)), g=list(g), **kwargs)
+
+
+class TestBasisBladeProducts:
+
+    def test_ortho_geometric_product(self):
+        ga = _ortho_ga()
+        basis = ga.basis
+        for i, ei in enumerate(basis):
+            assert ga.mul(ei, ei) == ga.g[i, i]
+            for ej in basis[i + 1:]:
+                assert ga.mul(ei, ej) == -ga.mul(ej, ei) == ga.wedge(ei, ej)
+
+        # associativity fixes the product of every pair of blades
+        blades = ga.blades.flat
+        for a, b, c in itertools.product(blades, repeat=3):
+            assert (ga.mul(ga.mul(a, b), c) - ga.mul(a, ga.mul(b, c))).expand() == 0
+
+    def test_ortho_single_grade_products(self):
+        ga = _ortho_ga()
+        blades = ga.blades.flat
+        for a, b in itertools.product(blades, repeat=2):
+            ra = ga.blades_to_grades_dict[a]
+            rb = ga.blades_to_grades_dict[b]
+            ab = ga.mul(a, b)
+            assert ga.wedge(a, b) == ga.get_grade(ab, ra + rb)
+            assert ga.left_contract(a, b) == (ga.get_grade(ab, rb - ra) if rb >= ra else 0)
+            assert ga.right_contract(a, b) == (ga.get_grade(ab, ra - rb) if ra >= rb else 0)
+            assert ga.scalar_product(a, b) == ga.get_grade(ab, 0)
+            if ra and rb:
+                assert ga.hestenes_dot(a, b) == ga.get_grade(ab, abs(ra - rb))
+            else:
+                assert ga.hestenes_dot(a, b) == 0
+
+    def test_impossible_grade_pairs_skipped(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3')
+        A = ga.mv('A', 'mv')
+        B = ga.mv('B', 'mv')
+        for product, op in [(ga.wedge, A.__xor__), (ga.left_contract, A.__lt__),
+                            (ga.scalar_product, lambda B: (A * B).get_grade(0))]:
+            assert (product(A.obj, B.obj) - op(B).obj).expand() == 0
+        # blade pairs that cannot contribute are never evaluated
+        grades = ga.blades_to_grades_dict
+        assert all(grades[a] + grades[b] <= 3 for a, b in ga.wedge.table_dict)
+        assert all(grades[a] == grades[b] for a, b in ga.scalar_product.table_dict)
+
+    def test_reduce_basis(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3')
+        g = ga.g
+
+        def reference(word):
+            # apply e_i e_j = 2 (e_i . e_j) - e_j e_i to the first pair out of order
+            for k in range(len(word) - 1):
+                i, j = word[k], word[k + 1]
+                if i == j:
+                    return {w: g[i, i] * c for w, c in reference(word[:k] + word[k + 2:]).items()}
+                if i > j:
+                    result = {w: 2 * g[i, j] * c for w, c in reference(word[:k] + word[k + 2:]).items()}
+                    for w, c in reference(word[:k] + (j, i) + word[k + 2:]).items():
+                        result[w] = result.get(w, 0) - c
+                    return result
+            return {word: S.One}
+
+        assert ga.reduce_basis([]) == ([1], [[]])
+        for length in range(5):
+            for word in itertools.product(range(3), repeat=length):
+                coefs, indexes = ga.reduce_basis(list(word))
+                result = dict(zip(map(tuple, indexes), coefs))
+                expected = {w: c.expand() for w, c in reference(word).items() if c.expand() != 0}
+                assert result == expected, word
+
+        # the reduction of every suffix is memoized
+        assert (1, 2) in ga._normal_order
+        assert (2, 1, 2) in ga._normal_order
+
+    def test_non_ortho_wedge(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3')
+        assert not ga.is_ortho
+        assert ga.wedge(e1.obj, e2.obj) == (e1 ^ e2).obj
+        assert ga.wedge(e2.obj, e1.obj) == -(e1 ^ e2).obj
+        assert ga.wedge(e1.obj, e1.obj) == 0
+        assert ga.wedge((e1 ^ e3).obj, e2.obj) == -(e1 ^ e2 ^ e3).obj
+
+    def test_table_dict_view(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g='1 # 0,# 1 #,0 # -1')
+        table = ga.mul.table_dict
+        assert table[e1.obj, e2.obj] == (e1 * e2).obj
+        # the entries are only held by table_terms, keyed by bitmasks
+        assert list(ga.mul.table_terms) == [(1, 2)]
+        assert list(table) == [(e1.obj, e2.obj)]
+        assert (e2.obj, e1.obj) not in table
+        table[e2.obj, e1.obj] = e3.obj
+        assert ga.mul.table_terms[2, 1] == ((4, 1),)
+        del table[e2.obj, e1.obj]
+        assert len(table) == 1
+
+
+class TestPrecompute:
+
+    def test_ortho_cayley_tables(self):
+        np = pytest.importorskip('numpy')
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=[1, -1, 2], precompute=True)
+        blades = ga.blades.flat
+        for product in [ga.mul, ga.wedge, ga.hestenes_dot,
+                        ga.left_contract, ga.right_contract, ga.scalar_product]:
+            assert len(product.table_dict) == len(blades) ** 2
+            table = product.cayley_table
+            for i, j in itertools.product(range(len(blades)), repeat=2):
+                value = product.table_dict[blades[i], blades[j]]
+                target = table.targets[i, j]
+                if target == -1:
+                    assert value == 0
+                else:
+                    assert value == table.signs[i, j] * table.coefs[i, j] * blades[target]
+
+        table = ga.mul.cayley_table
+        assert table.targets.dtype == np.intp and table.signs.dtype == np.int8
+        assert table.targets[1, 2] == 4
+        assert table.signs[2, 2] == -1 and table.coefs[2, 2] == 1
+        assert table.signs[3, 3] == 1 and table.coefs[3, 3] == 2
+        assert table.signs[2, 1] == -1 and table.targets[2, 1] == 4
+        assert (e1 * e2) * (e2 ^ e3) == -(e1 ^ e3)
+
+    def test_non_ortho(self):
+        ga = Ga('e*1|2', g=[[1, 1], [1, 0]], precompute=True)
+        blades = ga.blades.flat
+        assert all((a, b) in ga.mul.table_dict for a in blades for b in blades)
+        with pytest.raises(ValueError):
+            ga.mul.cayley_table
+
+    def test_symbolic_metric(self):
+        with pytest.raises(ValueError):
+            _ortho_ga(precompute=True)
+
+    @pytest.mark.parametrize('g', [[1, -1, 2], '1 1 0,1 2 0,0 0 -1'])
+    def test_workers(self, g):
+        ga1 = Ga('e*1|2|3', g=g, precompute=True)
+        ga2 = Ga('e*1|2|3', g=g)
+        ga2.precompute(workers=2)
+        blades = ga1.blades.flat
+        for name in Ga._blade_product_names:
+            table1 = getattr(ga1, name).table_dict
+            table2 = dict(getattr(ga2, name).table_dict)
+            assert all(table2[a, b] == table1[a, b] for a in blades for b in blades)
+        if not ga1.is_ortho:
+            assert ga2.basic_mul.table_dict == ga1.basic_mul.table_dict
+
+    def test_disk_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('GALGEBRA_CACHE_DIR', str(tmp_path))
+        ga1 = Ga('e*1|2|3', g='1 1 0,1 2 0,0 0 -1', precompute=True)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('not cached')
+        monkeypatch.setattr(_GeometricProductFunction, 'of_basis_blades', fail)
+        ga2 = Ga('e*1|2|3', g='1 1 0,1 2 0,0 0 -1', precompute=True)
+        blades = ga1.blades.flat
+        assert all(ga2.mul.table_dict[a, b] == ga1.mul.table_dict[a, b] for a in blades for b in blades)
+
+
+class TestOrthogonalize:
+
+    @pytest.mark.parametrize('g', [
+        '1 0 0 0,0 1 0 0,0 0 0 -1,0 0 -1 0',  # null basis of a conformal model
+        '2 1 0,1 2 1,0 1 2',
+    ])
+    def test_matches_non_ortho(self, g):
+        names = 'e*' + '|'.join(str(i + 1) for i in range(g.count(',') + 1))
+        ga1 = Ga(names, g=g)
+        ga2 = Ga(names, g=g, orthogonalize=True)
+        A1, B1 = ga1.mv('A', 'mv'), ga1.mv('B', 'mv')
+        A2, B2 = ga2.mv('A', 'mv'), ga2.mv('B', 'mv')
+        for op in ['__mul__', '__xor__', '__or__', '__lt__', '__gt__']:
+            assert getattr(A1, op)(B1).obj == getattr(A2, op)(B2).obj
+        assert ga1.e_sq == ga2.e_sq
+        assert ga1.r_basis == ga2.r_basis
+        assert ga1.g_inv == ga2.g_inv
+        # products never go through the base representation
+        assert 'basic_mul' not in vars(ga2)
+
+    def test_symbolic_metric(self):
+        with pytest.raises(ValueError):
+            Ga('e*1|2|3', orthogonalize=True)
+        # an orthogonal metric needs no change of frame
+        assert not _ortho_ga(orthogonalize=True)._orthogonalize
+
+
+class TestLazyConstruction:
+
+    def test_deferred(self):
+        x, y, z = coords = symbols('x y z', real=True)
+        ga = Ga('e', g=[1, 1, 1], coords=coords)
+        for name in ['e', 'e_sq', 'i', 'i_inv', 'sing_flg', 'de', 'grad', 'rgrad']:
+            assert name not in vars(ga)
+
+        assert ga.e.obj == ga.blades.flat[-1]
+        assert ga.e_sq == -1
+        assert ga.i * ga.i_inv == 1
+        assert not ga.sing_flg
+        assert ga.grads() == (ga.grad, ga.rgrad)
+        f = ga.mv('f', 'scalar', f=True)
+        assert (ga.grad * f).obj == ga.mv(f.obj.diff(x) * ga.basis[0] + f.obj.diff(y) * ga.basis[1] +
+                                          f.obj.diff(z) * ga.basis[2]).obj
+
+    def test_no_coords(self):
+        ga = Ga('e*1|2', g=[1, 1])
+        assert ga.de is None
+        with pytest.raises(ValueError):
+            ga.grads()
+        assert ga.sing_flg is False
+        assert Ga('e*1|2', g=[1, 0]).sing_flg is True
+
+
+class TestCacheLimits:
+
+    def test_lazy_dict_lru(self):
+        calls = []
+        d = lazy_dict({}, f_value=lambda k: calls.append(k) or k * 2, maxsize=2)
+        assert d[1] == 2 and d[2] == 4
+        d[1]  # now the most recently used
+        assert d[3] == 6
+        assert list(d) == [1, 3]
+        assert calls == [1, 2, 3]
+        d.maxsize = None
+        assert not d._tracked
+        d[4]
+        assert list(d) == [1, 3, 4]
+        d.maxsize = 1
+        assert list(d) == [4]
+
+    def test_algebra(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g='1 # 0,# 1 #,0 # -1', cache_limits=dict(mul=4))
+        A = ga.mv('A', 'mv')
+        B = ga.mv('B', 'mv')
+        expected = A * B
+        assert len(ga.mul.table_terms) <= 4
+        ga.set_cache_limits(mul=None, wedge=2)
+        assert (A * B).obj == expected.obj
+        assert len(ga.wedge.table_dict) == 0
+        (A ^ B)
+        assert len(ga.wedge.table_dict) == 2
+        with pytest.raises(ValueError):
+            ga.set_cache_limits(dbases=1)
+
+        ga.clear_caches()
+        assert len(ga.mul.table_dict) == 0
+        assert 'table_dict' not in vars(ga.basic_mul)
+        assert (A * B).obj == expected.obj
+
+
+class TestCacheStats:
+
+    def test_stats(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g='1 # 0,# 1 #,0 # -1')
+        A = ga.mv('A', 'mv')
+        B = ga.mv('B', 'mv')
+        stats = ga.cache_stats()
+        assert stats['mul'] == dict(entries=0, maxsize=None, hits=None, misses=0, compute_time=0.0)
+
+        ga.count_cache_hits()
+        A * B
+        stats = ga.cache_stats()
+        assert stats['mul']['misses'] == stats['mul']['entries'] == 64
+        assert stats['mul']['hits'] == 0
+        assert stats['mul']['compute_time'] > 0
+        assert stats['basic_mul']['misses'] == 1
+        assert stats['basic_mul']['entries'] == len(ga.basic_mul.table_dict)
+
+        A * B
+        stats = ga.cache_stats(reset=True)
+        assert stats['mul']['hits'] == 64
+        assert stats['mul']['misses'] == 64
+        stats = ga.cache_stats()
+        assert stats['mul']['hits'] == 0
+        assert stats['mul']['misses'] == 0
+        assert stats['basic_mul']['misses'] == 0
+        assert stats['mul']['entries'] == 64
+
+        ga.count_cache_hits(False)
+        assert not ga.mul.table_terms._tracked
+        assert ga.cache_stats()['mul']['hits'] is None
+
+    def test_connect(self):
+        from sympy import sin
+        r, th, phi = coords = symbols('r theta phi', real=True)
+        ga = Ga('e', g=[1, r**2, r**2 * sin(th)**2], coords=coords, norm=True)
+        assert 'connect' in ga.cache_stats()
+        assert 'basic_mul' not in ga.cache_stats()
+
+
+class TestThreads:
+
+    def test_shared_algebra(self):
+        from concurrent.futures import ThreadPoolExecutor
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g='1 # 0,# 1 #,0 # -1')
+        A = ga.mv('A', 'mv')
+        B = ga.mv('B', 'mv')
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda _: ((A * B).obj, ga.e_sq, ga.mul), range(8)))
+        ga2 = Ga('e*1|2|3', g='1 # 0,# 1 #,0 # -1')
+        expected = (ga2.mv('A', 'mv') * ga2.mv('B', 'mv')).obj
+        assert all(product == expected for product, _, _ in results)
+        # every thread sees the same cached objects
+        assert all(e_sq is ga.e_sq and mul is ga.mul for _, e_sq, mul in results)
+
+    def test_connection_cached(self):
+        from sympy import sin
+        r, th, phi = coords = symbols('r theta phi', real=True)
+        ga = Ga('e', g=[1, r**2, r**2 * sin(th)**2], coords=coords, norm=True)
+        args = (ga.r_basis[0], ga.blades.flat[1], '*', True)
+        assert ga.connection(*args) == 2 / r
+        # the second lookup finds the stored connection
+        assert ga.connection(*args) == 2 / r
+        assert len(ga.connect['*', True]) == 1
+
+
+class TestInterning:
+
+    def test_shared_tables(self):
+        ga1, a1, b1, c1 = Ga.build('a b c', g='1 # 0,# 1 #,0 # -1', intern=True)
+        expected = (a1 ^ b1) * (b1 + c1)
+        ga2, a2, b2, c2 = Ga.build('a b c', g='1 # 0,# 1 #,0 # -1', intern=True)
+        assert ga2 != ga1
+        assert ga2.mul.table_terms is ga1.mul.table_terms
+        assert ga2._normal_order is ga1._normal_order
+        assert ga2.blade_expansion_dict is ga1.blade_expansion_dict
+        assert ((a2 ^ b2) * (b2 + c2)).obj == expected.obj
+
+        # entries filled by either algebra are seen by the other
+        (a2 | c2).obj
+        assert ga2.hestenes_dot.table_dict.keys() == ga1.hestenes_dot.table_dict.keys()
+
+    def test_opt_in(self):
+        ga1 = Ga('e*1|2', g=[1, 1], intern=True)
+        assert Ga('e*1|2', g=[1, 1]).mul.table_terms is not ga1.mul.table_terms
+        assert Ga('e*1|2', g=[1, -1], intern=True).mul.table_terms is not ga1.mul.table_terms
+        assert Ga('f*1|2', g=[1, 1], intern=True).mul.table_terms is not ga1.mul.table_terms
+        assert Ga('e*1|2', g=[1, 1], intern=True).mul.table_terms is ga1.mul.table_terms
+
+    def test_weak(self):
+        import gc
+        from galgebra.ga import _interned_algebras
+        ga = Ga('e*1|2|3|4', g=[1, 1, 1, -1], intern=True)
+        key = ga._intern_key
+        assert _interned_algebras[key] is ga
+        del ga
+        gc.collect()
+        assert key not in _interned_algebras
+
+
+class TestDiskCache:
+
+    def test_reuse(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('GALGEBRA_CACHE_DIR', str(tmp_path))
+        ga1, a1, b1, c1 = Ga.build('a b c', g='1 # 0,# 1 #,0 # -1')
+        # construction is lazy, so nothing has been computed to store yet
+        assert list(tmp_path.iterdir()) == []
+        expected = (a1 ^ b1) * (b1 + c1)
+        ga1.e_sq, ga1.g_inv, ga1.r_basis
+        # each artifact is stored once it has been computed
+        n_entries = len(list(tmp_path.iterdir()))
+        assert n_entries > 0
+
+        # a second algebra loads everything from the cache
+        def fail(*args, **kwargs):
+            raise AssertionError('not cached')
+        monkeypatch.setattr(Ga, 'reduce_basis', fail)
+        ga2, a2, b2, c2 = Ga.build('a b c', g='1 # 0,# 1 #,0 # -1')
+        assert ga2.e_sq == ga1.e_sq
+        assert ga2.g_inv == ga1.g_inv
+        assert ga2.r_basis == ga1.r_basis
+        assert ((a2 ^ b2) * (b2 + c2)).obj == expected.obj
+
+        # a different metric gets a different entry
+        monkeypatch.undo()
+        monkeypatch.setenv('GALGEBRA_CACHE_DIR', str(tmp_path))
+        Ga('a b c', g='1 # 0,# 1 #,0 # 1').e_sq
+        assert len(list(tmp_path.iterdir())) > n_entries
+
+    def test_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.delenv('GALGEBRA_CACHE_DIR', raising=False)
+        Ga.build('a b', g='1 #,# 1')
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestHelpers:
+
+    def test_grade_operations(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=[1, 1, 1])
+        A = ga.mv('A', 'mv')
+        grade_dict = ga.grade_decomposition(A.obj)
+        assert sorted(grade_dict) == [0, 1, 2, 3]
+        for grade, part in grade_dict.items():
+            assert (part - A.get_grade(grade).obj).expand() == 0
+        assert (ga.reverse(A.obj) - A.rev().obj).expand() == 0
+        assert (ga.even_odd(A.obj, True) - A.even().obj).expand() == 0
+        assert (ga.even_odd(A.obj, False) - A.odd().obj).expand() == 0
+
+    def test_nc_subs(self):
+        x, y = symbols('x y')
+        a, b, c = symbols('a b c', commutative=False)
+        expr = x * a + y * a * b + b + 2
+        expected = x * c + y * (b + c) + b + 2
+        assert nc_subs(expr, {a: c, a * b: b + c}) == expected
+        assert nc_subs(expr, [(a, c), (a * b, b + c)]) == expected
+        assert nc_subs(expr, [a, a * b], [c, b + c]) == expected
+
+
+class TestNumpyKernels:
+
+    @pytest.mark.parametrize('g', [[1, 1, -1], '1 1 0,1 2 0,0 0 -1'])
+    def test_matches_symbolic(self, g):
+        np = pytest.importorskip('numpy')
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=g)
+        blades = ga.mv_blades.flat
+        rng = np.random.default_rng(0)
+        A = rng.integers(-5, 5, size=(4, len(blades)))
+        B = rng.integers(-5, 5, size=(len(blades),))
+        B_mv = sum((int(b) * blade for b, blade in zip(B, blades)), ga.mv(0, 'scalar'))
+        for product, op in [(ga.mul, '__mul__'), (ga.wedge, '__xor__'), (ga.hestenes_dot, '__or__'),
+                            (ga.left_contract, '__lt__'), (ga.right_contract, '__gt__')]:
+            result = product.numpy_kernel()(A, B)
+            assert result.shape == A.shape
+            for a, r in zip(A, result):
+                a_mv = sum((int(c) * blade for c, blade in zip(a, blades)), ga.mv(0, 'scalar'))
+                assert list(r) == [int(c) for c in getattr(a_mv, op)(B_mv).blade_coefs()]
+
+    def test_exact_and_cached(self):
+        np = pytest.importorskip('numpy')
+        from sympy import Rational
+        ga1 = Ga('e*1|2', g=[Rational(1, 2), 1], intern=True)
+        ga2 = Ga('e*1|2', g=[Rational(1, 2), 1], intern=True)
+        kernel = ga1.mul.numpy_kernel()
+        assert ga1.mul.numpy_kernel() is kernel
+        assert ga2.mul.numpy_kernel() is kernel
+        assert ga1.cache_stats()['numpy_kernels']['entries'] == 1
+        ga1.clear_caches()
+        assert ga1.mul.numpy_kernel() is not kernel
+
+        x, y = symbols('x y')
+        A = np.array([0, x, 0, 0], dtype=object)
+        B = np.array([0, y, 0, 0], dtype=object)
+        assert list(ga1.mul.numpy_kernel(exact=True)(A, B)) == [x * y / 2, 0, 0, 0]
+        assert ga1.mul.numpy_kernel()(np.eye(4)[1], np.eye(4)[1])[0] == 0.5
+
+    def test_symbolic_metric(self):
+        with pytest.raises(ValueError):
+            _ortho_ga().mul.numpy_kernel()
@@ -0,0 +1,72 @@
+import pytest
+from sympy import symbols
+
+from galgebra.ga import Ga
+from galgebra.lazy import LazyMv
+
+
+class TestLazyMv:
+
+    @pytest.mark.parametrize('g', [[1, 1, -1], '1 1 0,1 2 0,0 0 -1'])
+    def test_matches_eager(self, g):
+        x, y = symbols('x y', real=True)
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=g)
+        A = x + 2 * e1 + (e1 ^ e2) - y * (e1 ^ e2 ^ e3)
+        B = e2 - e3 + 3 * (e2 ^ e3)
+        lA = A.lazy()
+
+        assert (lA * B).evaluate() == A * B
+        assert (lA ^ B) == A ^ B
+        assert (lA | B) == A | B
+        assert (lA < B) == (A < B)
+        assert (lA > B) == (A > B)
+        assert (B.lazy() * lA) == B * A
+        assert (2 + lA) == 2 + A
+        assert (lA + B - 2 * lA) == A + B - 2 * A
+        assert (lA * B * lA).grade(2) == (A * B * A).get_grade(2)
+        assert (lA * B).rev() == (A * B).rev()
+        assert (lA * B).g_invol() == (A * B).g_invol()
+        assert (lA * B).even() == (A * B).even()
+        assert (lA * B).odd() == (A * B).odd()
+        assert lA.dual() == A.dual()
+        assert (lA * B).scalar() == (A * B).scalar()
+        assert str(lA * B) == str(A * B)
+        assert (-lA / 2).obj == (-A / 2).obj
+
+    def test_projection_pushed_down(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=[1, 1, 1])
+        A = (1 + e1 + (e1 ^ e2) + (e1 ^ e2 ^ e3)).lazy()
+        B = (e1 + e2).lazy()
+        AB = A * B
+        assert AB.grades == {0, 1, 2, 3}
+        assert AB.grade(3).grades == {3}
+
+        assert AB.grade(0) == 1
+        # only the vector part of A contributes to the scalar part
+        assert set(A._cache) == {frozenset({1})}
+        assert set(B._cache) == {frozenset({1})}
+
+    def test_shared_nodes(self):
+        ga, e1, e2 = Ga.build('e*1|2', g=[1, 1])
+        A = (e1 + 2 * e2).lazy()
+        AA = A * A
+        calls = []
+        compute = AA._compute
+
+        def counting(grades):
+            calls.append(grades)
+            return compute(grades)
+        AA._compute = counting
+
+        assert isinstance(AA + AA, LazyMv)
+        assert (AA + AA).evaluate() == 10
+        assert (AA * AA).evaluate() == 25
+        assert len(calls) == 1
+
+        with pytest.raises(ValueError):
+            A * Ga.build('e*1|2', g=[1, -1])[1]
+
+    def test_abstract(self):
+        ga, e1, e2 = Ga.build('e*1|2', g=[1, 1])
+        with pytest.raises(TypeError):
+            LazyMv(ga)
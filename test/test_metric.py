@@ -0,0 +1,127 @@
+from sympy import symbols, sin, cos, Symbol, S, Matrix, diag, simplify, trigsimp, expand
+
+from galgebra import metric
+from galgebra.ga import Ga
+from galgebra.metric import linear_expand, simplify_coef, simplify_coefs, Simp
+
+
+class TestLinearExpand:
+
+    def test_split(self):
+        x, y = symbols('x y')
+        e1, e2 = symbols('e1 e2', commutative=False)
+
+        coefs, bases = linear_expand((x + y) * (e1 + 2 * e2) + x + 3 * x * e1)
+        assert dict(zip(bases, coefs)) == {S.One: x, e1: 4 * x + y, e2: 2 * x + 2 * y}
+
+        assert linear_expand(S.Zero) == ([S.Zero], [S.One])
+        assert linear_expand(x * y) == ([x * y], [S.One])
+        assert linear_expand(sin(x) * e2) == ([sin(x)], [e2])
+
+    def test_skips_expand(self, monkeypatch):
+        x, y = symbols('x y')
+        e1, e2 = symbols('e1 e2', commutative=False)
+
+        def fail(expr):
+            raise AssertionError('expand called')
+        monkeypatch.setattr(metric, 'expand', fail)
+        coefs, bases = linear_expand(x * y * e1 + x**2 * e2 + sin(x) * e1 + y)
+        assert dict(zip(bases, coefs)) == {S.One: y, e1: x * y + sin(x), e2: x**2}
+
+    def test_cache(self):
+        x = Symbol('x')
+        e1 = Symbol('e1', commutative=False)
+        expr = (x + 1) * e1
+        coefs, bases = linear_expand(expr)
+        assert coefs == [x + 1]
+
+        # callers may modify the returned lists
+        coefs.append(x)
+        bases.pop()
+        assert linear_expand(expr) == ([x + 1], [e1])
+        assert metric._linear_expand_cache[id(expr)][0] is expr
+
+
+class TestSimplifyCoef:
+
+    def test_cache(self):
+        x = Symbol('x')
+        calls = []
+
+        def mode(expr):
+            calls.append(expr)
+            return trigsimp(expr)
+
+        Simp.clear_cache()
+        coef = sin(x)**2 + cos(x)**2
+        assert simplify_coef(coef, mode) == 1
+        assert simplify_coef(sin(x)**2 + cos(x)**2, [mode]) == 1
+        assert calls == [coef]
+
+        # the functions applied are part of the key
+        assert simplify_coef(coef, [mode, expand]) == 1
+        assert simplify_coef(coef, expand) == coef
+        assert len(calls) == 2
+
+        Simp.clear_cache()
+        assert simplify_coef(coef, mode) == 1
+        assert len(calls) == 3
+
+    def test_atoms(self):
+        x = Symbol('x')
+        Simp.clear_cache()
+        assert simplify_coef(x, simplify) == x
+        assert simplify_coef(S(2), [simplify, trigsimp]) == 2
+        assert not metric._simplify_cache
+
+    def test_bounded(self, monkeypatch):
+        x = Symbol('x')
+        monkeypatch.setattr(metric, '_SIMPLIFY_CACHE_SIZE', 2)
+        Simp.clear_cache()
+        for i in range(5):
+            assert simplify_coef(x + i, simplify) == x + i
+        assert list(metric._simplify_cache) == [(x + 3, (simplify,)), (x + 4, (simplify,))]
+
+
+    def test_workers(self, monkeypatch):
+        x, y = symbols('x y', real=True)
+        coefs = [
+            (x**2 - y**2) / (x - y), sin(x)**2 + cos(x)**2, S(3),
+            (x**2 - y**2) / (x - y), (x**2 + 2*x*y + y**2) / (x + y),
+        ]
+        Simp.clear_cache()
+        result = simplify_coefs(coefs, [simplify], workers=2)
+        assert result == [x + y, 1, 3, x + y, x + y]
+        assert len(metric._simplify_cache) == 3
+
+        ga, e1, e2 = Ga.build('e*1|2', g=[1, 1])
+        A = coefs[0] * e1 + coefs[4] * e2 + coefs[1]
+        Simp.clear_cache()
+        assert A.simplify(workers=2) == A.simplify()
+
+        # the global default
+        Simp.clear_cache()
+        monkeypatch.setattr(Simp, 'workers', 2)
+        assert Simp.apply(A.obj) == A.simplify().obj
+
+        Simp.shutdown_workers()
+        assert metric._simplify_pool is None
+        Simp.shutdown_workers()
+        Simp.clear_cache()
+        assert simplify_coefs(coefs, [simplify], workers=2) == result
+        Simp.shutdown_workers()
+
+
+class TestCongruenceDiagonalize:
+
+    def test_diagonalizes(self):
+        for g in [
+            Matrix([[0, -1], [-1, 0]]),
+            Matrix([[1, 0, 0], [0, 0, -1], [0, -1, 0]]),
+            Matrix([[0, 1, 1], [1, 0, 1], [1, 1, 0]]),
+            Matrix([[2, 1, 0], [1, 2, 1], [0, 1, 2]]),
+            Matrix([[0, 0], [0, 1]]),
+        ]:
+            P, squares = metric._congruence_diagonalize(g)
+            assert P.det() != 0
+            assert (P.T * g * P).expand() == diag(*squares)
@@ -481,3 +481,73 @@ class TestMv:
         with pytest.raises(ValueError, match='null blade'):
             f0.project_in_blade((f0 + f1) ^ f2)
 
+    def test_blade_terms(self):
+        """Products and sums keep coefficients split by blade, building obj lazily."""
+        ga, e1, e2, e3 = Ga.build('e*1|2|3')
+        a = ga.mv('a', 'mv')
+        b = ga.mv('b', 'vector')
+
+        ab = a * b
+        assert ab._obj is None
+        assert ab.grades == [0, 1, 2, 3]
+        for grade in range(4):
+            assert ab.get_grade(grade).obj == ga.get_grade(ga.mul(a.obj, b.obj), grade).expand()
+        assert ab.obj == ga.mul(a.obj, b.obj).expand()
+        assert (ab - ab).is_zero()
+        assert (ab + 1).scalar() == ab.scalar() + 1
+        assert (2 - ab).rev() == 2 - ab.rev()
+        assert ab.even() + ab.odd() == ab
+        assert ab.g_invol() == ab.even() - ab.odd()
+
+        # assigning obj discards the split coefficients
+        c = a ^ b
+        c.obj = e1.obj
+        assert c._blade_terms() == {0b1: 1}
+
+    def test_python_scalar(self):
+        ga, e1, e2 = Ga.build('e*1|2', g=[1, 1])
+        zero = ga.mv(0, 'scalar')
+        two = ga.mv(2, 'scalar')
+        assert e1 + zero == e1
+        assert e1 * two == two * e1 == 2 * e1
+        assert (two ^ e1) == 2 * e1
+
+    def test_compile(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=[1, 1, 1])
+        t, s = symbols('t s', real=True)
+        R = sympy.cos(t / 2) - sympy.sin(t / 2) * (e1 ^ e2)
+        X = R * (s * e1 + e3) * R.rev()
+
+        f = X.compile([t, s])
+        assert X.compile([t, s]) is f
+        values = f(0.5, 2.0)
+        expected = [c.subs({t: 0.5, s: 2.0}) for c in X.blade_coefs()]
+        assert values == pytest.approx([float(c) for c in expected])
+
+        # assigning a new value discards the compiled function
+        X.obj = e1.obj
+        assert X.compile([t, s])(0.5, 2.0) == [0, 1, 0, 0, 0, 0, 0, 0]
+
+    def test_sandwich(self):
+        x, y = symbols('x y', real=True)
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g='1 1 0,1 2 0,0 0 -1')
+        X = x + 2 * e1 + (e1 ^ e2) - y * (e1 ^ e2 ^ e3)
+        for V in [e1, e1 + 2 * e3, e1 * e2, 1 + (e1 ^ e2), e1 * (e2 + e3) * e3]:
+            Vinv = V.inv()
+            expected = V * (X.g_invol() if V == V.odd() else X) * Vinv
+            assert V.sandwich(X) == expected
+            assert ga.sandwich(V, X) == expected
+            # the images of basis blades are cached on the versor
+            assert set(V._sandwich_columns()) == {0, 1, 3, 7}
+
+        with pytest.raises(ValueError):
+            (1 + e1).sandwich(X)
+
+        # is_versor() only keeps the images it computed for a versor
+        assert V.is_versor()
+        assert V._sandwich is not None
+        ga6 = Ga('e*1|2|3|4|5|6', g=[1] * 6)
+        V = 1 + ga6.I()
+        assert (V * V.rev()).is_scalar()
+        assert not V.is_versor()
+        assert V._sandwich is None
@@ -0,0 +1,64 @@
+import pytest
+from sympy import symbols, S
+
+from galgebra.ga import Ga
+
+np = pytest.importorskip('numpy')
+from galgebra.mvarray import MvArray  # noqa: E402
+
+
+class TestMvArray:
+
+    def test_roundtrip(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=[1, 1, 1])
+        mvs = [1 + 2 * e1, e1 ^ e2, 3 * (e1 ^ e2 ^ e3) - e3]
+        arr = MvArray.from_mvs(mvs)
+        assert arr.coefs.dtype == float
+        assert arr.shape == (3,)
+        assert arr.to_mvs() == mvs
+        assert arr[1].to_mvs() == [e1 ^ e2]
+        with pytest.raises(ValueError):
+            MvArray(ga, np.zeros((2, 3)))
+
+    @pytest.mark.parametrize('g', [[1, 1, -1], '1 1 0,1 2 0,0 0 -1'])
+    def test_operations(self, g):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=g)
+        A = [1 + 2 * e1, e1 ^ e2, 3 * (e1 ^ e2 ^ e3) - e3, e2 + (e1 ^ e3)]
+        B = [e2 - e3, 2 + (e2 ^ e3), e1 * e2, 5 * e3]
+        arr_A = MvArray.from_mvs(A)
+        arr_B = MvArray.from_mvs(B)
+        for op in ['__mul__', '__xor__', '__or__', '__lt__', '__gt__', '__add__', '__sub__']:
+            expected = [getattr(a, op)(b) for a, b in zip(A, B)]
+            assert getattr(arr_A, op)(arr_B).to_mvs() == expected
+            # a single multivector is broadcast
+            expected = [getattr(a, op)(B[0]) for a in A]
+            assert getattr(arr_A, op)(B[0]).to_mvs() == expected
+        for method in ['rev', 'g_invol', 'ccon', 'dual', 'even', 'odd']:
+            assert getattr(arr_A, method)().to_mvs() == [getattr(a, method)() for a in A]
+        for r in range(4):
+            assert arr_A.grade(r).to_mvs() == [a.get_grade(r) for a in A]
+        assert list(arr_A.scalar()) == [float(a.scalar()) for a in A]
+        assert (2 * arr_A).to_mvs() == [2 * a for a in A]
+        # scalars are added to the scalar part, as for Mv
+        assert (arr_A + 1).to_mvs() == [a + 1 for a in A]
+        assert (1 - arr_A).to_mvs() == [1 - a for a in A]
+        assert (arr_A - S.Half).to_mvs() == [a - S.Half for a in A]
+        with pytest.raises(TypeError):
+            arr_A + 'a'
+
+    def test_symbolic(self):
+        x, y = symbols('x y', real=True)
+        ga, e1, e2 = Ga.build('e*1|2', g=[x, 1])
+        A = [y * e1, e1 + e2]
+        arr = MvArray.from_mvs(A)
+        assert arr.coefs.dtype == object
+        assert (arr * arr).to_mvs() == [a * a for a in A]
+        assert (arr ^ e2).to_mvs() == [a ^ e2 for a in A]
+        assert (arr + x).to_mvs() == [a + x for a in A]
+
+    def test_sandwich(self):
+        ga, e1, e2, e3 = Ga.build('e*1|2|3', g=[1, 1, 1])
+        A = [1 + 2 * e1, e1 ^ e2, 3 * (e1 ^ e2 ^ e3) - e3]
+        arr = MvArray.from_mvs(A)
+        for V in [e1 + e2, 1 + (e1 ^ e2)]:
+            assert arr.sandwich(V).to_mvs() == [V.sandwich(a) for a in A]
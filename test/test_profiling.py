@@ -0,0 +1,77 @@
+import sympy
+from sympy import symbols, sin
+
+from galgebra import ga as _ga, metric, printer
+from galgebra.ga import Ga
+from galgebra.profiling import PHASES, profile
+
+
+class TestProfile:
+
+    def test_phases(self):
+        with profile() as p:
+            r, th, phi = coords = symbols('r theta phi', real=True)
+            ga = Ga('e', g=[1, r**2, r**2 * sin(th)**2], coords=coords, norm=True)
+            f = ga.mv('f', 'vector', f=True)
+            div = ga.grad * f
+            str(div.simplify())
+            ga2 = Ga('a b', g='1 #,# 1')
+            A = ga2.mv('A', 'mv')
+            A * A
+        for phase in ['tables', 'linear_expand', 'simplify', 'conversion', 'derivatives', 'dop', 'printing']:
+            assert p.calls[phase] > 0, phase
+            assert 0 < p.times[phase] <= p.total_time
+        report = p.report()
+        assert set(report['phases']) == set(PHASES)
+        assert report['phases']['dop']['calls'] == p.calls['dop']
+        assert 'simplify' in str(p)
+
+    def test_restored(self):
+        apply = metric.Simp.__dict__['apply']
+        with profile():
+            with profile():
+                assert _ga.expand is not sympy.expand
+            assert _ga.expand is not sympy.expand
+        assert _ga.expand is sympy.expand
+        assert metric.Simp.__dict__['apply'] is apply
+        assert 'doprint' not in vars(printer.GaPrinter)
+
+    def test_threads(self):
+        import threading
+        started, done = threading.Event(), threading.Event()
+        other = profile()
+
+        def idle():
+            with other:
+                started.set()
+                done.wait()
+
+        thread = threading.Thread(target=idle)
+        thread.start()
+        started.wait()
+        with profile() as p:
+            ga, e1, e2 = Ga.build('e*1|2', g=[1, 1])
+            e1 * e2
+        # still patched for the other thread
+        assert _ga.expand is not sympy.expand
+        done.set()
+        thread.join()
+        assert _ga.expand is sympy.expand
+        assert p.calls['tables'] > 0
+        assert other.calls['tables'] == 0
+
+    def test_decorator(self):
+        p = profile()
+
+        @p
+        def product():
+            ga, e1, e2 = Ga.build('e*1|2', g=[1, 1])
+            return e1 * e2
+
+        product()
+        calls = p.calls['tables']
+        assert calls > 0
+        product()
+        assert p.calls['tables'] == 2 * calls
+        p.reset()
+        assert p.calls['tables'] == 0